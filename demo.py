@@ -4,17 +4,22 @@ Demo script for Smart Crop Planning & Risk Mapping Assistant
 This script demonstrates the core functionality without the Streamlit interface.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 from modules.farmer_profile import FarmerProfile
 from modules.crop_recommendation import CropRecommender
 from modules.risk_analysis import RiskAnalyzer
 from modules.financial_planner import FinancialPlanner
 from modules.chatbot import CropChatbot
 
+def _rupee(value) -> str:
+    """Format a value as a rupee amount with thousands separators."""
+    return f"₹{value:,.0f}"
+
 def demo_farmer_profile():
     """Demo farmer profile creation and analysis."""
-    print("🌾 Smart Crop Planning & Risk Mapping Assistant - Demo")
-    print("=" * 60)
-    
+    lines = ["🌾 Smart Crop Planning & Risk Mapping Assistant - Demo", "=" * 60]
+
     # Create a sample farmer profile
     farmer = FarmerProfile(
         name="Rajesh Kumar",
@@ -38,52 +43,55 @@ def demo_farmer_profile():
         longitude=74.8723
     )
     
-    print(f"👨‍🌾 Farmer Profile Created: {farmer.name}")
-    print(f"   Location: {farmer.state}, {farmer.district}")
-    print(f"   Land: {farmer.total_acres} acres ({farmer.irrigated_acres} irrigated)")
-    print(f"   Investment Capacity: ₹{farmer.investment_capacity:,}")
-    print(f"   Risk Tolerance: {farmer.risk_tolerance}")
-    
+    lines.append(f"👨‍🌾 Farmer Profile Created: {farmer.name}")
+    lines.append(f"   Location: {farmer.state}, {farmer.district}")
+    lines.append(f"   Land: {farmer.total_acres} acres ({farmer.irrigated_acres} irrigated)")
+    lines.append(f"   Investment Capacity: {_rupee(farmer.investment_capacity)}")
+    lines.append(f"   Risk Tolerance: {farmer.risk_tolerance}")
+
     # Get financial profile
     financial_profile = farmer.get_financial_profile()
-    print(f"   Net Worth: ₹{financial_profile['net_worth']:,.0f}")
-    print(f"   Risk Capacity: ₹{financial_profile['risk_capacity']:,.0f}")
-    
+    lines.append(f"   Net Worth: {_rupee(financial_profile['net_worth'])}")
+    lines.append(f"   Risk Capacity: {_rupee(financial_profile['risk_capacity'])}")
+
+    # One buffered write instead of a dozen line-flushed prints
+    print("\n".join(lines))
+
     return farmer
 
 def demo_crop_recommendations(farmer):
     """Demo crop recommendation system."""
-    print("\n🌱 Crop Recommendations")
-    print("-" * 30)
-    
+    lines = ["\n🌱 Crop Recommendations", "-" * 30]
+
     recommender = CropRecommender()
     recommendations = recommender.get_recommendations(farmer)
-    
-    print(f"Total Recommendations: {recommendations['total_recommendations']}")
-    print(f"Overall Risk Level: {recommendations['risk_profile']['level']}")
-    
+
+    lines.append(f"Total Recommendations: {recommendations['total_recommendations']}")
+    lines.append(f"Overall Risk Level: {recommendations['risk_profile']['level']}")
+
     for i, crop in enumerate(recommendations['crops'], 1):
-        print(f"\n{i}. {crop['name']} ({crop['category']})")
-        print(f"   Expected Yield: {crop['expected_yield']} tons/acre")
-        print(f"   Investment: ₹{crop['investment']:,}")
-        print(f"   Expected Revenue: ₹{crop['expected_revenue']:,}")
-        print(f"   Net Profit: ₹{crop['net_profit']:,}")
-        print(f"   ROI: {crop['roi']:.1f}%")
-        print(f"   Risk Level: {crop['risk_level']}")
-    
+        lines.append(f"\n{i}. {crop['name']} ({crop['category']})")
+        lines.append(f"   Expected Yield: {crop['expected_yield']:.2f} tons/acre")
+        lines.append(f"   Investment: {_rupee(crop['investment'])}")
+        lines.append(f"   Expected Revenue: {_rupee(crop['expected_revenue'])}")
+        lines.append(f"   Net Profit: {_rupee(crop['net_profit'])}")
+        lines.append(f"   ROI: {crop['roi']:.1f}%")
+        lines.append(f"   Risk Level: {crop['risk_level']}")
+
+    print("\n".join(lines))
+
     return recommendations
 
 def demo_risk_analysis(farmer, crop_recommendations):
     """Demo risk analysis system."""
-    print("\n⚠️ Risk Analysis")
-    print("-" * 20)
-    
-    analyzer = RiskAnalyzer()
+    lines = ["\n⚠️ Risk Analysis", "-" * 20]
+
+    analyzer = RiskAnalyzer.instance()
     risk_analysis = analyzer.analyze_risks(farmer, crop_recommendations)
-    
-    print(f"Overall Risk Level: {risk_analysis['overall_risk']}")
-    print(f"Risk Score: {risk_analysis['risk_score']:.2f}")
-    
+
+    lines.append(f"Overall Risk Level: {risk_analysis['overall_risk']}")
+    lines.append(f"Risk Score: {risk_analysis['risk_score']:.2f}")
+
     risk_categories = [
         ("Disease Risk", risk_analysis['disease_risk']),
         ("Pest Risk", risk_analysis['pest_risk']),
@@ -94,53 +102,60 @@ def demo_risk_analysis(farmer, crop_recommendations):
     ]
     
     for category, risk_data in risk_categories:
-        print(f"\n{category}:")
-        print(f"   Level: {risk_data['level']}")
-        print(f"   Probability: {risk_data['probability']:.1f}%")
-        print(f"   Mitigation: {risk_data['mitigation']}")
-    
+        lines.append(f"\n{category}:")
+        lines.append(f"   Level: {risk_data['level']}")
+        lines.append(f"   Probability: {risk_data['probability']:.1f}%")
+        lines.append(f"   Mitigation: {risk_data['mitigation']}")
+
     # Risk tolerance analysis
     tolerance = risk_analysis['tolerance_analysis']
-    print(f"\nRisk Tolerance Analysis:")
-    print(f"   Compatibility Score: {tolerance['compatibility_score']:.1f}%")
-    print(f"   Recommendation: {tolerance['adjusted_recommendation']}")
-    
+    lines.append(f"\nRisk Tolerance Analysis:")
+    lines.append(f"   Compatibility Score: {tolerance['compatibility_score']:.1f}%")
+    lines.append(f"   Recommendation: {tolerance['adjusted_recommendation']}")
+
+    print("\n".join(lines))
+
     return risk_analysis
 
 def demo_financial_analysis(farmer, crop_recommendations):
     """Demo financial analysis system."""
-    print("\n💰 Financial Analysis")
-    print("-" * 25)
-    
+    lines = ["\n💰 Financial Analysis", "-" * 25]
+
     planner = FinancialPlanner()
     financial_analysis = planner.analyze_financials(farmer, crop_recommendations)
-    
-    print(f"Total Investment: ₹{financial_analysis['total_investment']:,}")
-    print(f"Expected Revenue: ₹{financial_analysis['total_revenue']:,}")
-    print(f"Net Profit: ₹{financial_analysis['net_profit']:,}")
-    print(f"ROI: {financial_analysis['roi']:.1f}%")
-    print(f"Profit Margin: {financial_analysis['profit_margin']:.1f}%")
-    print(f"Investment per Acre: ₹{financial_analysis['investment_per_acre']:,}")
-    print(f"Revenue per Acre: ₹{financial_analysis['revenue_per_acre']:,}")
-    
+
+    lines.append(f"Total Investment: {_rupee(financial_analysis['total_investment'])}")
+    lines.append(f"Expected Revenue: {_rupee(financial_analysis['total_revenue'])}")
+    lines.append(f"Net Profit: {_rupee(financial_analysis['net_profit'])}")
+    lines.append(f"ROI: {financial_analysis['roi']:.1f}%")
+    lines.append(f"Profit Margin: {financial_analysis['profit_margin']:.1f}%")
+    lines.append(f"Investment per Acre: {_rupee(financial_analysis['investment_per_acre'])}")
+    lines.append(f"Revenue per Acre: {_rupee(financial_analysis['revenue_per_acre'])}")
+
     # Break-even analysis
-    print(f"\nBreak-even Analysis:")
-    print(f"   Break-even Yield: {financial_analysis['break_even_yield']:.2f} tons/acre")
-    print(f"   Break-even Price: ₹{financial_analysis['break_even_price']:,}/ton")
-    print(f"   Safety Margin: {financial_analysis['safety_margin']:.1f}%")
-    
+    lines.append(f"\nBreak-even Analysis:")
+    lines.append(f"   Break-even Yield: {financial_analysis['break_even_yield']:.2f} tons/acre")
+    lines.append(f"   Break-even Price: {_rupee(financial_analysis['break_even_price'])}/ton")
+    lines.append(f"   Safety Margin: {financial_analysis['safety_margin']:.1f}%")
+
     # Financial health
-    print(f"\nFinancial Health: {financial_analysis['financial_health']}")
-    
+    lines.append(f"\nFinancial Health: {financial_analysis['financial_health']}")
+
+    print("\n".join(lines))
+
     return financial_analysis
 
-def demo_chatbot():
-    """Demo AI chatbot functionality."""
-    print("\n🤖 AI Assistant Demo")
-    print("-" * 20)
-    
-    chatbot = CropChatbot()
-    
+def demo_chatbot() -> str:
+    """Demo AI chatbot functionality.
+
+    Returns the rendered output instead of printing so it can run
+    concurrently with the other demo stages without interleaving.
+    """
+    lines = ["\n🤖 AI Assistant Demo", "-" * 20]
+
+    # The demo never reads the conversation history, so skip recording it
+    chatbot = CropChatbot(track_history=False)
+
     # Sample questions
     questions = [
         "What is the ideal spacing for wheat cultivation?",
@@ -149,41 +164,52 @@ def demo_chatbot():
         "How can I manage pests in cotton?",
         "What government schemes are available for farmers?"
     ]
-    
-    for question in questions:
-        print(f"\nQ: {question}")
-        response = chatbot.get_response(question)
-        print(f"A: {response}")
-    
+
+    # History tracking is off, so get_response has no shared state to
+    # mutate and the questions can be answered concurrently.
+    with ThreadPoolExecutor(max_workers=len(questions)) as ex:
+        responses = list(ex.map(chatbot.get_response, questions))
+
+    for question, response in zip(questions, responses):
+        lines.append(f"\nQ: {question}")
+        lines.append(f"A: {response}")
+
     # Get farming tips
-    print(f"\n🌱 Farming Tips for Wheat:")
+    lines.append(f"\n🌱 Farming Tips for Wheat:")
     tips = chatbot.get_farming_tips("wheat")
     for tip in tips:
-        print(f"   • {tip}")
-    
+        lines.append(f"   • {tip}")
+
     # Emergency advice
-    print(f"\n🚨 Emergency Advice for Drought:")
+    lines.append(f"\n🚨 Emergency Advice for Drought:")
     emergency_advice = chatbot.get_emergency_advice("drought")
-    print(f"   {emergency_advice}")
+    lines.append(f"   {emergency_advice}")
+
+    return "\n".join(lines)
 
 def main():
     """Run the complete demo."""
     try:
-        # Demo farmer profile
-        farmer = demo_farmer_profile()
-        
-        # Demo crop recommendations
-        crop_recommendations = demo_crop_recommendations(farmer)
-        
-        # Demo risk analysis
-        risk_analysis = demo_risk_analysis(farmer, crop_recommendations)
-        
-        # Demo financial analysis
-        financial_analysis = demo_financial_analysis(farmer, crop_recommendations)
-        
-        # Demo chatbot
-        demo_chatbot()
-        
+        # The chatbot demo has no dependency on the farmer chain, so it
+        # runs concurrently; its output is printed once the chain is done.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            chatbot_future = executor.submit(demo_chatbot)
+
+            # Demo farmer profile
+            farmer = demo_farmer_profile()
+
+            # Demo crop recommendations
+            crop_recommendations = demo_crop_recommendations(farmer)
+
+            # Demo risk analysis
+            risk_analysis = demo_risk_analysis(farmer, crop_recommendations)
+
+            # Demo financial analysis
+            financial_analysis = demo_financial_analysis(farmer, crop_recommendations)
+
+            # Demo chatbot
+            print(chatbot_future.result())
+
         print("\n" + "=" * 60)
         print("✅ Demo completed successfully!")
         print("🚀 To run the full application: streamlit run app.py")
@@ -1,367 +1,454 @@
-from typing import Dict, List, Any
-import random
-from datetime import datetime, timedelta
-
-class CropRecommender:
-    """Crop recommendation system based on farmer profile and location."""
-    
-    def __init__(self):
-        self.crop_database = self._initialize_crop_database()
-    
-    def _initialize_crop_database(self) -> Dict[str, Dict[str, Any]]:
-        """Initialize crop database with Indian crops."""
-        return {
-            "wheat": {
-                "name": "Wheat",
-                "category": "Cereal",
-                "duration": "Rabi",
-                "growth_duration": 120,
-                "water_requirement": "Medium",
-                "soil_preference": ["Loamy", "Clay"],
-                "climate_zones": ["Temperate", "Subtropical"],
-                "regions": ["North-West", "North"],
-                "base_yield": 3.5,  # tons/acre
-                "base_price": 2200,  # ₹/ton
-                "base_investment": 25000,  # ₹/acre
-                "sowing_season": "October-November",
-                "harvest_time": "March-April",
-                "risk_level": "Low",
-                "disease_risk": "Medium",
-                "pest_risk": "Low"
-            },
-            "rice": {
-                "name": "Rice",
-                "category": "Cereal",
-                "duration": "Kharif",
-                "growth_duration": 150,
-                "water_requirement": "High",
-                "soil_preference": ["Clay", "Alluvial"],
-                "climate_zones": ["Tropical", "Subtropical"],
-                "regions": ["North", "South", "West"],
-                "base_yield": 4.0,
-                "base_price": 1800,
-                "base_investment": 30000,
-                "sowing_season": "June-July",
-                "harvest_time": "October-November",
-                "risk_level": "Medium",
-                "disease_risk": "High",
-                "pest_risk": "Medium"
-            },
-            "maize": {
-                "name": "Maize",
-                "category": "Cereal",
-                "duration": "Kharif/Rabi",
-                "growth_duration": 100,
-                "water_requirement": "Medium",
-                "soil_preference": ["Loamy", "Sandy"],
-                "climate_zones": ["Tropical", "Subtropical"],
-                "regions": ["North-West", "West", "South"],
-                "base_yield": 3.0,
-                "base_price": 1600,
-                "base_investment": 20000,
-                "sowing_season": "June-July / January-February",
-                "harvest_time": "September-October / April-May",
-                "risk_level": "Medium",
-                "disease_risk": "Medium",
-                "pest_risk": "Medium"
-            },
-            "cotton": {
-                "name": "Cotton",
-                "category": "Fiber",
-                "duration": "Kharif",
-                "growth_duration": 180,
-                "water_requirement": "Medium",
-                "soil_preference": ["Black Soil", "Red Soil"],
-                "climate_zones": ["Tropical", "Subtropical"],
-                "regions": ["West", "South"],
-                "base_yield": 1.5,  # bales/acre
-                "base_price": 6000,  # ₹/bale
-                "base_investment": 35000,
-                "sowing_season": "May-June",
-                "harvest_time": "October-December",
-                "risk_level": "High",
-                "disease_risk": "High",
-                "pest_risk": "High"
-            },
-            "sugarcane": {
-                "name": "Sugarcane",
-                "category": "Cash Crop",
-                "duration": "Annual",
-                "growth_duration": 365,
-                "water_requirement": "High",
-                "soil_preference": ["Alluvial", "Clay"],
-                "climate_zones": ["Tropical", "Subtropical"],
-                "regions": ["North", "West", "South"],
-                "base_yield": 80,  # tons/acre
-                "base_price": 300,  # ₹/ton
-                "base_investment": 50000,
-                "sowing_season": "February-March",
-                "harvest_time": "November-March",
-                "risk_level": "Medium",
-                "disease_risk": "Medium",
-                "pest_risk": "Low"
-            },
-            "pulses": {
-                "name": "Pulses (Chickpea)",
-                "category": "Pulse",
-                "duration": "Rabi",
-                "growth_duration": 120,
-                "water_requirement": "Low",
-                "soil_preference": ["Loamy", "Sandy"],
-                "climate_zones": ["Temperate", "Subtropical"],
-                "regions": ["North-West", "North", "West"],
-                "base_yield": 1.2,
-                "base_price": 4500,
-                "base_investment": 15000,
-                "sowing_season": "October-November",
-                "harvest_time": "March-April",
-                "risk_level": "Low",
-                "disease_risk": "Low",
-                "pest_risk": "Low"
-            },
-            "vegetables": {
-                "name": "Mixed Vegetables",
-                "category": "Horticulture",
-                "duration": "Short-term",
-                "growth_duration": 60,
-                "water_requirement": "High",
-                "soil_preference": ["Loamy", "Alluvial"],
-                "climate_zones": ["Tropical", "Subtropical"],
-                "regions": ["All"],
-                "base_yield": 8.0,  # tons/acre
-                "base_price": 8000,  # ₹/ton
-                "base_investment": 40000,
-                "sowing_season": "Year-round",
-                "harvest_time": "60-90 days",
-                "risk_level": "Medium",
-                "disease_risk": "High",
-                "pest_risk": "High"
-            }
-        }
-    
-    def get_recommendations(self, farmer_profile) -> Dict[str, Any]:
-        """Get crop recommendations based on farmer profile."""
-        suitable_crops = self._filter_suitable_crops(farmer_profile)
-        recommended_crops = self._rank_crops(suitable_crops, farmer_profile)
-        
-        return {
-            "crops": recommended_crops,
-            "total_recommendations": len(recommended_crops),
-            "risk_profile": self._calculate_overall_risk(recommended_crops),
-            "investment_summary": self._calculate_investment_summary(recommended_crops, farmer_profile)
-        }
-    
-    def _filter_suitable_crops(self, farmer_profile) -> List[Dict[str, Any]]:
-        """Filter crops suitable for the farmer's conditions."""
-        suitable_crops = []
-        
-        for crop_key, crop_data in self.crop_database.items():
-            # Check soil compatibility
-            if farmer_profile.soil_type in crop_data["soil_preference"]:
-                # Check climate zone compatibility
-                if farmer_profile.get_location_profile()["climate_zone"] in crop_data["climate_zones"]:
-                    # Check region compatibility
-                    if (crop_data["regions"] == ["All"] or 
-                        farmer_profile.get_location_profile()["region"] in crop_data["regions"]):
-                        
-                        # Check water availability
-                        if self._check_water_compatibility(crop_data, farmer_profile):
-                            suitable_crops.append({
-                                "key": crop_key,
-                                **crop_data
-                            })
-        
-        return suitable_crops
-    
-    def _check_water_compatibility(self, crop_data, farmer_profile) -> bool:
-        """Check if water requirements are compatible with farmer's irrigation."""
-        if crop_data["water_requirement"] == "Low":
-            return True
-        elif crop_data["water_requirement"] == "Medium":
-            return farmer_profile.irrigated_acres > 0
-        else:  # High water requirement
-            return farmer_profile.irrigated_acres >= farmer_profile.total_acres * 0.5
-    
-    def _rank_crops(self, suitable_crops, farmer_profile) -> List[Dict[str, Any]]:
-        """Rank crops based on farmer's profile and preferences."""
-        ranked_crops = []
-        
-        for crop in suitable_crops:
-            # Calculate adjusted metrics
-            adjusted_yield = self._adjust_yield(crop, farmer_profile)
-            adjusted_price = self._adjust_price(crop, farmer_profile)
-            adjusted_investment = self._adjust_investment(crop, farmer_profile)
-            
-            # Calculate financial metrics
-            expected_revenue = adjusted_yield * adjusted_price
-            net_profit = expected_revenue - adjusted_investment
-            roi = (net_profit / adjusted_investment) * 100 if adjusted_investment > 0 else 0
-            
-            # Calculate risk-adjusted score
-            risk_score = self._calculate_risk_score(crop, farmer_profile)
-            
-            ranked_crops.append({
-                "name": crop["name"],
-                "category": crop["category"],
-                "expected_yield": f"{adjusted_yield:.2f}",
-                "sowing_season": crop["sowing_season"],
-                "harvest_time": crop["harvest_time"],
-                "water_requirement": crop["water_requirement"],
-                "growth_duration": crop["growth_duration"],
-                "investment": adjusted_investment,
-                "expected_revenue": expected_revenue,
-                "net_profit": net_profit,
-                "roi": roi,
-                "risk_level": crop["risk_level"],
-                "irrigation_cost": self._calculate_irrigation_cost(crop, farmer_profile),
-                "risk_score": risk_score
-            })
-        
-        # Sort by risk-adjusted ROI
-        ranked_crops.sort(key=lambda x: x["roi"] * (1 - x["risk_score"]), reverse=True)
-        
-        # Limit to top 5 recommendations
-        return ranked_crops[:5]
-    
-    def _adjust_yield(self, crop, farmer_profile) -> float:
-        """Adjust yield based on farmer's conditions."""
-        base_yield = crop["base_yield"]
-        
-        # Adjust for soil type
-        soil_multipliers = {
-            "Clay": 1.0,
-            "Sandy": 0.8,
-            "Loamy": 1.1,
-            "Red Soil": 0.9,
-            "Black Soil": 1.0,
-            "Alluvial": 1.2
-        }
-        soil_multiplier = soil_multipliers.get(farmer_profile.soil_type, 1.0)
-        
-        # Adjust for experience
-        experience_multiplier = min(1.2, 1.0 + (farmer_profile.experience_years * 0.01))
-        
-        # Adjust for irrigation
-        irrigation_coverage = farmer_profile.irrigated_acres / farmer_profile.total_acres
-        irrigation_multiplier = 0.8 + (irrigation_coverage * 0.4)
-        
-        return base_yield * soil_multiplier * experience_multiplier * irrigation_multiplier
-    
-    def _adjust_price(self, crop, farmer_profile) -> float:
-        """Adjust price based on market conditions and location."""
-        base_price = crop["base_price"]
-        
-        # Regional price variations
-        regional_multipliers = {
-            "North-West": 1.1,
-            "North": 1.0,
-            "West": 0.95,
-            "South": 0.9
-        }
-        regional_multiplier = regional_multipliers.get(
-            farmer_profile.get_location_profile()["region"], 1.0
-        )
-        
-        # Seasonal adjustments (simplified)
-        current_month = datetime.now().month
-        if crop["duration"] == "Kharif" and current_month in [6, 7, 8, 9]:
-            seasonal_multiplier = 1.1
-        elif crop["duration"] == "Rabi" and current_month in [10, 11, 12, 1, 2]:
-            seasonal_multiplier = 1.1
-        else:
-            seasonal_multiplier = 1.0
-        
-        return base_price * regional_multiplier * seasonal_multiplier
-    
-    def _adjust_investment(self, crop, farmer_profile) -> float:
-        """Adjust investment based on farmer's conditions."""
-        base_investment = crop["base_investment"]
-        
-        # Adjust for scale
-        scale_multiplier = 1.0 if farmer_profile.total_acres <= 5 else 0.9
-        
-        # Adjust for irrigation type
-        irrigation_multipliers = {
-            "Well": 1.1,
-            "Canal": 0.9,
-            "Borewell": 1.0,
-            "Rainfed": 0.8,
-            "Mixed": 1.0
-        }
-        irrigation_multiplier = irrigation_multipliers.get(farmer_profile.irrigation_type, 1.0)
-        
-        return base_investment * scale_multiplier * irrigation_multiplier
-    
-    def _calculate_irrigation_cost(self, crop, farmer_profile) -> float:
-        """Calculate irrigation cost for the crop."""
-        base_irrigation_cost = {
-            "Low": 5000,
-            "Medium": 10000,
-            "High": 15000
-        }
-        
-        base_cost = base_irrigation_cost.get(crop["water_requirement"], 10000)
-        
-        # Adjust based on irrigation type
-        if farmer_profile.irrigation_type == "Canal":
-            return base_cost * 0.5
-        elif farmer_profile.irrigation_type == "Well":
-            return base_cost * 0.8
-        else:
-            return base_cost
-    
-    def _calculate_risk_score(self, crop, farmer_profile) -> float:
-        """Calculate risk score for the crop."""
-        base_risk = {"Low": 0.2, "Medium": 0.5, "High": 0.8}
-        risk_score = base_risk.get(crop["risk_level"], 0.5)
-        
-        # Adjust based on farmer's risk tolerance
-        if farmer_profile.risk_tolerance == "Low":
-            risk_score *= 1.2
-        elif farmer_profile.risk_tolerance == "High":
-            risk_score *= 0.8
-        
-        # Adjust based on experience
-        if farmer_profile.experience_years > 10:
-            risk_score *= 0.9
-        
-        return min(1.0, risk_score)
-    
-    def _calculate_overall_risk(self, crops) -> Dict[str, Any]:
-        """Calculate overall risk profile for recommendations."""
-        if not crops:
-            return {"level": "Unknown", "score": 0}
-        
-        avg_risk_score = sum(crop["risk_score"] for crop in crops) / len(crops)
-        
-        if avg_risk_score < 0.3:
-            risk_level = "Low"
-        elif avg_risk_score < 0.6:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "level": risk_level,
-            "score": avg_risk_score,
-            "distribution": {
-                "Low": len([c for c in crops if c["risk_level"] == "Low"]),
-                "Medium": len([c for c in crops if c["risk_level"] == "Medium"]),
-                "High": len([c for c in crops if c["risk_level"] == "High"])
-            }
-        }
-    
-    def _calculate_investment_summary(self, crops, farmer_profile) -> Dict[str, Any]:
-        """Calculate investment summary for all recommendations."""
-        if not crops:
-            return {"total_investment": 0, "affordable_crops": 0}
-        
-        total_investment = sum(crop["investment"] for crop in crops)
-        affordable_crops = len([c for c in crops if c["investment"] <= farmer_profile.investment_capacity])
-        
-        return {
-            "total_investment": total_investment,
-            "affordable_crops": affordable_crops,
-            "investment_per_acre": total_investment / farmer_profile.total_acres,
-            "utilization_rate": (total_investment / farmer_profile.investment_capacity) * 100
-        }
+from typing import Dict, List, Any
+import functools
+import numpy as np
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+try:
+    from numba import njit
+except ImportError:  # numba is an optional accelerator
+    njit = None
+
+# Integer codes for the categorical crop/farmer attributes; the SoA arrays
+# below are indexed by these.
+_SOIL_IDS = {"Clay": 0, "Sandy": 1, "Loamy": 2, "Red Soil": 3, "Black Soil": 4, "Alluvial": 5}
+_CLIMATE_IDS = {"Temperate": 0, "Subtropical": 1, "Tropical": 2}
+_REGION_IDS = {"North-West": 0, "North": 1, "West": 2, "South": 3, "Other": 4}
+_WATER_IDS = {"Low": 0, "Medium": 1, "High": 2}
+_RISK_IDS = {"Low": 0, "Medium": 1, "High": 2}
+
+# Adjustment tables, built once at import. The NumPy lookup tables are
+# indexed by the codes above; the dicts key on raw profile strings.
+_SOIL_YIELD_MULT = np.array([1.0, 0.8, 1.1, 0.9, 1.0, 1.2])  # by _SOIL_IDS
+_REGION_PRICE_MULT = np.array([1.1, 1.0, 0.95, 0.9, 1.0])  # by _REGION_IDS
+_BASE_RISK = np.array([0.2, 0.5, 0.8])  # by _RISK_IDS
+_IRRIGATION_COST = np.array([5000.0, 10000.0, 15000.0])  # by _WATER_IDS
+_IRRIGATION_INVEST_MULT = {"Well": 1.1, "Canal": 0.9, "Borewell": 1.0, "Rainfed": 0.8, "Mixed": 1.0}
+_IRRIGATION_COST_FACTOR = {"Canal": 0.5, "Well": 0.8}
+
+
+def _rank_kernel(yields, prices, invests, risk_codes, water_codes, seasonal,
+                 yield_mul, price_mul, invest_mul, risk_mul, cost_mul):
+    """Numeric core of crop ranking over the SoA arrays.
+
+    Pure array math over float64/int64 inputs so numba can lower it to
+    machine code; falls back to plain NumPy when numba is unavailable.
+    """
+    adjusted_yield = yields * yield_mul
+    adjusted_price = prices * seasonal * price_mul
+    adjusted_investment = invests * invest_mul
+    expected_revenue = adjusted_yield * adjusted_price
+    net_profit = expected_revenue - adjusted_investment
+    roi = np.where(adjusted_investment > 0, net_profit / adjusted_investment * 100, 0.0)
+    risk_score = np.minimum(1.0, _BASE_RISK[risk_codes] * risk_mul)
+    irrigation_cost = _IRRIGATION_COST[water_codes] * cost_mul
+    score = roi * (1.0 - risk_score)
+    return (adjusted_yield, adjusted_investment, expected_revenue, net_profit,
+            roi, risk_score, irrigation_cost, score)
+
+
+if njit is not None:
+    _rank_kernel = njit(cache=True, fastmath=True)(_rank_kernel)
+    # Warm the compile cache at import so the first request doesn't pay
+    # for JIT compilation
+    _empty_f = np.empty(0)
+    _empty_i = np.empty(0, dtype=np.int64)
+    _rank_kernel(_empty_f, _empty_f, _empty_f, _empty_i, _empty_i, _empty_f,
+                 1.0, 1.0, 1.0, 1.0, 1.0)
+    del _empty_f, _empty_i
+
+
+def _build_crop_db() -> Dict[str, Dict[str, Any]]:
+    """Crop database with Indian crops, built once at import."""
+    db = {
+        "wheat": {
+            "name": "Wheat",
+            "category": "Cereal",
+            "duration": "Rabi",
+            "growth_duration": 120,
+            "water_requirement": "Medium",
+            "soil_preference": ["Loamy", "Clay"],
+            "climate_zones": ["Temperate", "Subtropical"],
+            "regions": ["North-West", "North"],
+            "base_yield": 3.5,  # tons/acre
+            "base_price": 2200,  # ₹/ton
+            "base_investment": 25000,  # ₹/acre
+            "sowing_season": "October-November",
+            "harvest_time": "March-April",
+            "risk_level": "Low",
+            "disease_risk": "Medium",
+            "pest_risk": "Low"
+        },
+        "rice": {
+            "name": "Rice",
+            "category": "Cereal",
+            "duration": "Kharif",
+            "growth_duration": 150,
+            "water_requirement": "High",
+            "soil_preference": ["Clay", "Alluvial"],
+            "climate_zones": ["Tropical", "Subtropical"],
+            "regions": ["North", "South", "West"],
+            "base_yield": 4.0,
+            "base_price": 1800,
+            "base_investment": 30000,
+            "sowing_season": "June-July",
+            "harvest_time": "October-November",
+            "risk_level": "Medium",
+            "disease_risk": "High",
+            "pest_risk": "Medium"
+        },
+        "maize": {
+            "name": "Maize",
+            "category": "Cereal",
+            "duration": "Kharif/Rabi",
+            "growth_duration": 100,
+            "water_requirement": "Medium",
+            "soil_preference": ["Loamy", "Sandy"],
+            "climate_zones": ["Tropical", "Subtropical"],
+            "regions": ["North-West", "West", "South"],
+            "base_yield": 3.0,
+            "base_price": 1600,
+            "base_investment": 20000,
+            "sowing_season": "June-July / January-February",
+            "harvest_time": "September-October / April-May",
+            "risk_level": "Medium",
+            "disease_risk": "Medium",
+            "pest_risk": "Medium"
+        },
+        "cotton": {
+            "name": "Cotton",
+            "category": "Fiber",
+            "duration": "Kharif",
+            "growth_duration": 180,
+            "water_requirement": "Medium",
+            "soil_preference": ["Black Soil", "Red Soil"],
+            "climate_zones": ["Tropical", "Subtropical"],
+            "regions": ["West", "South"],
+            "base_yield": 1.5,  # bales/acre
+            "base_price": 6000,  # ₹/bale
+            "base_investment": 35000,
+            "sowing_season": "May-June",
+            "harvest_time": "October-December",
+            "risk_level": "High",
+            "disease_risk": "High",
+            "pest_risk": "High"
+        },
+        "sugarcane": {
+            "name": "Sugarcane",
+            "category": "Cash Crop",
+            "duration": "Annual",
+            "growth_duration": 365,
+            "water_requirement": "High",
+            "soil_preference": ["Alluvial", "Clay"],
+            "climate_zones": ["Tropical", "Subtropical"],
+            "regions": ["North", "West", "South"],
+            "base_yield": 80,  # tons/acre
+            "base_price": 300,  # ₹/ton
+            "base_investment": 50000,
+            "sowing_season": "February-March",
+            "harvest_time": "November-March",
+            "risk_level": "Medium",
+            "disease_risk": "Medium",
+            "pest_risk": "Low"
+        },
+        "pulses": {
+            "name": "Pulses (Chickpea)",
+            "category": "Pulse",
+            "duration": "Rabi",
+            "growth_duration": 120,
+            "water_requirement": "Low",
+            "soil_preference": ["Loamy", "Sandy"],
+            "climate_zones": ["Temperate", "Subtropical"],
+            "regions": ["North-West", "North", "West"],
+            "base_yield": 1.2,
+            "base_price": 4500,
+            "base_investment": 15000,
+            "sowing_season": "October-November",
+            "harvest_time": "March-April",
+            "risk_level": "Low",
+            "disease_risk": "Low",
+            "pest_risk": "Low"
+        },
+        "vegetables": {
+            "name": "Mixed Vegetables",
+            "category": "Horticulture",
+            "duration": "Short-term",
+            "growth_duration": 60,
+            "water_requirement": "High",
+            "soil_preference": ["Loamy", "Alluvial"],
+            "climate_zones": ["Tropical", "Subtropical"],
+            "regions": ["All"],
+            "base_yield": 8.0,  # tons/acre
+            "base_price": 8000,  # ₹/ton
+            "base_investment": 40000,
+            "sowing_season": "Year-round",
+            "harvest_time": "60-90 days",
+            "risk_level": "Medium",
+            "disease_risk": "High",
+            "pest_risk": "High"
+        }
+    }
+    # Frozensets make every membership probe O(1), both here and for
+    # any direct consumers of the database
+    for c in db.values():
+        c["soil_preference"] = frozenset(c["soil_preference"])
+        c["climate_zones"] = frozenset(c["climate_zones"])
+        c["regions"] = frozenset(c["regions"])
+    return db
+
+
+# Struct-of-arrays view of the crop database, shared read-only by every
+# recommender instance. Filtering and ranking run as elementwise NumPy
+# expressions over these parallel arrays instead of per-crop Python calls.
+_CROP_DB = _build_crop_db()
+_CROP_LIST = list(_CROP_DB.values())
+_YIELDS = np.array([c["base_yield"] for c in _CROP_LIST])
+_PRICES = np.array([c["base_price"] for c in _CROP_LIST], dtype=np.float64)
+_INVESTS = np.array([c["base_investment"] for c in _CROP_LIST], dtype=np.float64)
+_RISK_CODES = np.array([_RISK_IDS[c["risk_level"]] for c in _CROP_LIST])
+_WATER_CODES = np.array([_WATER_IDS[c["water_requirement"]] for c in _CROP_LIST])
+_IS_KHARIF = np.array([c["duration"] == "Kharif" for c in _CROP_LIST])
+_IS_RABI = np.array([c["duration"] == "Rabi" for c in _CROP_LIST])
+# Compatibility is bit-packed into one uint64 per crop: soils occupy bits
+# 0-7, climate zones 8-15, regions 16-23 (bit 23 = grows in all regions)
+# and water requirement one-hot in 24-26. Filtering is then a couple of
+# branchless AND/compare operations over a single array.
+_ZONE_SHIFT = 8
+_REGION_SHIFT = 16
+_ALL_REGIONS_BIT = 1 << (_REGION_SHIFT + 7)
+_WATER_SHIFT = 24
+_WATER_LOW_BIT = np.uint64(0b001 << _WATER_SHIFT)
+_WATER_LOW_MED_BITS = np.uint64(0b011 << _WATER_SHIFT)
+_WATER_ANY_BITS = np.uint64(0b111 << _WATER_SHIFT)
+
+
+def _pack_crop_mask(crop: Dict[str, Any]) -> int:
+    """Pack one crop's suitability sets into the uint64 bit layout above."""
+    mask = 0
+    for soil, i in _SOIL_IDS.items():
+        if soil in crop["soil_preference"]:
+            mask |= 1 << i
+    for zone, i in _CLIMATE_IDS.items():
+        if zone in crop["climate_zones"]:
+            mask |= 1 << (_ZONE_SHIFT + i)
+    for region, i in _REGION_IDS.items():
+        if region in crop["regions"]:
+            mask |= 1 << (_REGION_SHIFT + i)
+    if "All" in crop["regions"]:
+        mask |= _ALL_REGIONS_BIT
+    mask |= 1 << (_WATER_SHIFT + _WATER_IDS[crop["water_requirement"]])
+    return mask
+
+
+_CROP_MASKS = np.array([_pack_crop_mask(c) for c in _CROP_LIST], dtype=np.uint64)
+
+# Per-request context: everything the filter/rank path needs from the
+# farmer profile, resolved once into tuple slots instead of repeated
+# attribute and table lookups inside the helpers.
+_Ctx = namedtuple("_Ctx", (
+    "soil_id", "zone_id", "region_id",
+    "irrigated_acres", "total_acres", "investment_capacity",
+    "yield_mul", "regional_mul", "invest_mul", "risk_mul", "cost_mul",
+    "current_month"))
+
+
+@functools.lru_cache(maxsize=256)
+def _archetype_multipliers(soil_id, region_id, irrigation_type, risk_tolerance,
+                           experience_years):
+    """Specialized multipliers for one farmer archetype.
+
+    Profiles cluster around a small Cartesian product of categorical
+    attributes; the constants derived from them are evaluated once per
+    archetype and reused for every profile that matches it.
+    """
+    soil_mul = _SOIL_YIELD_MULT[soil_id] if soil_id is not None else 1.0
+    experience_mul = min(1.2, 1.0 + (experience_years * 0.01))
+    risk_mul = {"Low": 1.2, "High": 0.8}.get(risk_tolerance, 1.0)
+    if experience_years > 10:
+        risk_mul *= 0.9
+    return (float(soil_mul * experience_mul),
+            float(_REGION_PRICE_MULT[region_id]),
+            _IRRIGATION_INVEST_MULT.get(irrigation_type, 1.0),
+            risk_mul,
+            _IRRIGATION_COST_FACTOR.get(irrigation_type, 1.0))
+
+
+def _build_ctx(profile, current_month) -> _Ctx:
+    """Resolve a farmer profile into the scalar context for one request."""
+    soil_id = _SOIL_IDS.get(profile.soil_type)
+    zone_id = _CLIMATE_IDS.get(profile.climate_zone)
+    region_id = _REGION_IDS.get(profile.region, _REGION_IDS["Other"])
+
+    soil_exp_mul, regional_mul, irr_invest_mul, risk_mul, cost_mul = \
+        _archetype_multipliers(soil_id, region_id, profile.irrigation_type,
+                               profile.risk_tolerance, profile.experience_years)
+
+    # Continuous attributes stay outside the archetype cache
+    irrigation_mul = 0.8 + (profile.irrigation_coverage * 0.4)
+    scale_mul = 1.0 if profile.total_acres <= 5 else 0.9
+
+    return _Ctx(
+        soil_id=soil_id,
+        zone_id=zone_id,
+        region_id=region_id,
+        irrigated_acres=profile.irrigated_acres,
+        total_acres=profile.total_acres,
+        investment_capacity=profile.investment_capacity,
+        yield_mul=soil_exp_mul * irrigation_mul,
+        regional_mul=regional_mul,
+        invest_mul=scale_mul * irr_invest_mul,
+        risk_mul=risk_mul,
+        cost_mul=cost_mul,
+        current_month=current_month)
+
+
+class CropRecommender:
+    """Crop recommendation system based on farmer profile and location."""
+
+    def __init__(self):
+        # The database and its array views are module-level and shared;
+        # instances only carry their memoization cache
+        self.crop_database = _CROP_DB
+        # Bound per instance so the cache dies with the recommender;
+        # FarmerProfile is frozen and hashable, so it keys directly
+        self._cached_recommendations = functools.lru_cache(maxsize=1024)(
+            self._compute_recommendations)
+
+    def get_recommendations(self, farmer_profile) -> Dict[str, Any]:
+        """Get crop recommendations based on farmer profile.
+
+        Results are memoized per (profile, month); the month in the key
+        invalidates cached entries when the season changes.
+        """
+        return self._cached_recommendations(farmer_profile, datetime.now().month)
+
+    def _compute_recommendations(self, farmer_profile, current_month) -> Dict[str, Any]:
+        """Run the filter/rank pipeline for a profile (cache miss path)."""
+        ctx = _build_ctx(farmer_profile, current_month)
+        suitable_crops = self._filter_suitable_crops(ctx)
+        recommended_crops = self._rank_crops(suitable_crops, ctx)
+
+        return {
+            "crops": recommended_crops,
+            "total_recommendations": len(recommended_crops),
+            "risk_profile": self._calculate_overall_risk(recommended_crops),
+            "investment_summary": self._calculate_investment_summary(recommended_crops, ctx)
+        }
+
+    def _filter_suitable_crops(self, ctx: _Ctx) -> np.ndarray:
+        """Boolean mask over the crop arrays for the farmer's conditions."""
+        if ctx.soil_id is None or ctx.zone_id is None:
+            return np.zeros(len(_CROP_LIST), dtype=bool)
+
+        # Soil and zone bits must both be set; region matches either the
+        # farmer's region bit or the grows-everywhere bit
+        required = np.uint64((1 << ctx.soil_id) | (1 << (_ZONE_SHIFT + ctx.zone_id)))
+        region_bits = np.uint64((1 << (_REGION_SHIFT + ctx.region_id)) | _ALL_REGIONS_BIT)
+
+        # Water availability: Low always fits, Medium needs any irrigation,
+        # High needs at least half the land irrigated
+        if ctx.irrigated_acres >= ctx.total_acres * 0.5:
+            water_bits = _WATER_ANY_BITS
+        elif ctx.irrigated_acres > 0:
+            water_bits = _WATER_LOW_MED_BITS
+        else:
+            water_bits = _WATER_LOW_BIT
+
+        return (((_CROP_MASKS & required) == required)
+                & ((_CROP_MASKS & region_bits) != 0)
+                & ((_CROP_MASKS & water_bits) != 0))
+
+    def _rank_crops(self, suitable_mask, ctx: _Ctx) -> List[Dict[str, Any]]:
+        """Rank suitable crops with vectorized adjustments over the SoA arrays."""
+        idx = np.flatnonzero(suitable_mask)
+        if idx.size == 0:
+            return []
+
+        # Seasonal adjustments (simplified)
+        in_kharif = ctx.current_month in (6, 7, 8, 9)
+        in_rabi = ctx.current_month in (10, 11, 12, 1, 2)
+        seasonal_multiplier = np.where(
+            (_IS_KHARIF[idx] & in_kharif) | (_IS_RABI[idx] & in_rabi), 1.1, 1.0)
+
+        (adjusted_yield, adjusted_investment, expected_revenue, net_profit,
+         roi, risk_score, irrigation_cost, score) = _rank_kernel(
+            _YIELDS[idx], _PRICES[idx], _INVESTS[idx],
+            _RISK_CODES[idx], _WATER_CODES[idx], seasonal_multiplier,
+            ctx.yield_mul, ctx.regional_mul, ctx.invest_mul,
+            ctx.risk_mul, ctx.cost_mul)
+
+        # Select the top 5 by risk-adjusted ROI: O(n) partition to pick the
+        # candidates, then sort only those for display order
+        if score.size > 5:
+            top = np.argpartition(-score, 5)[:5]
+        else:
+            top = np.arange(score.size)
+        order = top[np.argsort(-score[top])]
+
+        ranked_crops = []
+        for j in order:
+            crop = _CROP_LIST[idx[j]]
+            ranked_crops.append({
+                "name": crop["name"],
+                "category": crop["category"],
+                "expected_yield": float(adjusted_yield[j]),
+                "sowing_season": crop["sowing_season"],
+                "harvest_time": crop["harvest_time"],
+                "water_requirement": crop["water_requirement"],
+                "growth_duration": crop["growth_duration"],
+                "investment": float(adjusted_investment[j]),
+                "expected_revenue": float(expected_revenue[j]),
+                "net_profit": float(net_profit[j]),
+                "roi": float(roi[j]),
+                "risk_level": crop["risk_level"],
+                "irrigation_cost": float(irrigation_cost[j]),
+                "risk_score": float(risk_score[j])
+            })
+
+        return ranked_crops
+
+    def _calculate_overall_risk(self, crops) -> Dict[str, Any]:
+        """Calculate overall risk profile for recommendations."""
+        if not crops:
+            return {"level": "Unknown", "score": 0}
+
+        # One pass accumulates the score sum and the level distribution
+        total_score = 0.0
+        distribution = {"Low": 0, "Medium": 0, "High": 0}
+        for crop in crops:
+            total_score += crop["risk_score"]
+            distribution[crop["risk_level"]] += 1
+        avg_risk_score = total_score / len(crops)
+
+        if avg_risk_score < 0.3:
+            risk_level = "Low"
+        elif avg_risk_score < 0.6:
+            risk_level = "Medium"
+        else:
+            risk_level = "High"
+
+        return {
+            "level": risk_level,
+            "score": avg_risk_score,
+            "distribution": distribution
+        }
+
+    def _calculate_investment_summary(self, crops, ctx: _Ctx) -> Dict[str, Any]:
+        """Calculate investment summary for all recommendations."""
+        if not crops:
+            return {"total_investment": 0, "affordable_crops": 0}
+
+        total_investment = 0.0
+        affordable_crops = 0
+        for crop in crops:
+            total_investment += crop["investment"]
+            if crop["investment"] <= ctx.investment_capacity:
+                affordable_crops += 1
+
+        return {
+            "total_investment": total_investment,
+            "affordable_crops": affordable_crops,
+            "investment_per_acre": total_investment / ctx.total_acres if ctx.total_acres > 0 else 0,
+            "utilization_rate": (total_investment / ctx.investment_capacity) * 100
+                                if ctx.investment_capacity > 0 else 0
+        }
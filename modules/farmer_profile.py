@@ -1,11 +1,20 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any
 import json
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # optional fast serializer
+    orjson = None
+
+@dataclass(frozen=True, slots=True)
 class FarmerProfile:
-    """Farmer profile with personal, financial, and land information."""
-    
+    """Farmer profile with personal, financial, and land information.
+
+    Frozen and slotted so instances are hashable (usable directly as
+    cache keys) and carry no per-instance __dict__.
+    """
+
     # Personal Information
     name: str
     age: int
@@ -32,23 +41,52 @@ class FarmerProfile:
     district: str
     latitude: float
     longitude: float
-    
+
+    # Derived metrics (computed once in __post_init__)
+    total_assets: float = field(init=False, repr=False, compare=False)
+    net_worth: float = field(init=False, repr=False, compare=False)
+    debt_to_income_ratio: float = field(init=False, repr=False, compare=False)
+    investment_ratio: float = field(init=False, repr=False, compare=False)
+    available_capital: float = field(init=False, repr=False, compare=False)
+    risk_capacity: float = field(init=False, repr=False, compare=False)
+    region: str = field(init=False, repr=False, compare=False)
+    climate_zone: str = field(init=False, repr=False, compare=False)
+    irrigation_coverage: float = field(init=False, repr=False, compare=False)
+    _location_profile: Dict[str, Any] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
-        """Calculate derived financial metrics."""
-        self.total_assets = self.savings + (self.total_acres * self.land_value)
-        self.net_worth = self.total_assets - self.bank_loan
-        self.debt_to_income_ratio = self.bank_loan / self.annual_income if self.annual_income > 0 else 0
-        self.investment_ratio = self.investment_capacity / self.annual_income if self.annual_income > 0 else 0
-        
+        """Calculate derived financial and location metrics."""
+        object.__setattr__(self, 'total_assets', self.savings + (self.total_acres * self.land_value))
+        object.__setattr__(self, 'net_worth', self.total_assets - self.bank_loan)
+        object.__setattr__(self, 'debt_to_income_ratio',
+                           self.bank_loan / self.annual_income if self.annual_income > 0 else 0)
+        object.__setattr__(self, 'investment_ratio',
+                           self.investment_capacity / self.annual_income if self.annual_income > 0 else 0)
+        object.__setattr__(self, 'available_capital', min(self.investment_capacity, self.savings * 0.7))
+        object.__setattr__(self, 'risk_capacity', self._calculate_risk_capacity())
+        # Location attributes are read per-crop by the recommender; resolve
+        # them once instead of rebuilding the profile dict on every call
+        object.__setattr__(self, 'region', self._get_region())
+        object.__setattr__(self, 'climate_zone', self._get_climate_zone())
+        object.__setattr__(self, 'irrigation_coverage',
+                           self.irrigated_acres / self.total_acres if self.total_acres > 0 else 0)
+        object.__setattr__(self, '_location_profile', {
+            "state": self.state,
+            "district": self.district,
+            "coordinates": (self.latitude, self.longitude),
+            "region": self.region,
+            "climate_zone": self.climate_zone
+        })
+
     def get_financial_profile(self) -> Dict[str, Any]:
-        """Get financial profile summary."""
+        """Get financial profile summary (pure packer over cached attrs)."""
         return {
             "total_assets": self.total_assets,
             "net_worth": self.net_worth,
             "debt_to_income_ratio": self.debt_to_income_ratio,
             "investment_ratio": self.investment_ratio,
-            "available_capital": min(self.investment_capacity, self.savings * 0.7),
-            "risk_capacity": self._calculate_risk_capacity()
+            "available_capital": self.available_capital,
+            "risk_capacity": self.risk_capacity
         }
     
     def _calculate_risk_capacity(self) -> float:
@@ -73,7 +111,7 @@ class FarmerProfile:
             "total_acres": self.total_acres,
             "irrigated_acres": self.irrigated_acres,
             "rainfed_acres": self.total_acres - self.irrigated_acres,
-            "irrigation_coverage": (self.irrigated_acres / self.total_acres) * 100,
+            "irrigation_coverage": self.irrigation_coverage * 100,
             "soil_type": self.soil_type,
             "irrigation_type": self.irrigation_type,
             "land_value_total": self.total_acres * self.land_value
@@ -81,13 +119,7 @@ class FarmerProfile:
     
     def get_location_profile(self) -> Dict[str, Any]:
         """Get location profile summary."""
-        return {
-            "state": self.state,
-            "district": self.district,
-            "coordinates": (self.latitude, self.longitude),
-            "region": self._get_region(),
-            "climate_zone": self._get_climate_zone()
-        }
+        return self._location_profile
     
     def _get_region(self) -> str:
         """Get agricultural region based on state."""
@@ -129,14 +161,19 @@ class FarmerProfile:
     
     def save_to_file(self, filename: str):
         """Save profile to JSON file."""
-        with open(filename, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
-    
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(self.to_dict(), f, indent=2)
+
     @classmethod
     def load_from_file(cls, filename: str) -> 'FarmerProfile':
         """Load profile from JSON file."""
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         
         return cls(
             name=data["personal"]["name"],
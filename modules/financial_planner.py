@@ -1,75 +1,149 @@
 from typing import Dict, List, Any
+import bisect
+import functools
 import numpy as np
 from datetime import datetime, timedelta
+from types import MappingProxyType
+
+try:
+    from numba import njit
+except ImportError:  # numba is an optional accelerator
+    njit = None
+
+# Cost structures for different farming activities, built once at import
+# and shared read-only by every planner instance
+_COST_STRUCTURES = MappingProxyType({
+    "land_preparation": MappingProxyType({
+        "plowing": 2000,  # ₹/acre
+        "harrowing": 1500,
+        "leveling": 1000,
+        "seed_bed": 500
+    }),
+    "seeds": MappingProxyType({
+        "wheat": 800,
+        "rice": 1200,
+        "maize": 600,
+        "cotton": 1500,
+        "sugarcane": 3000,
+        "pulses": 400,
+        "vegetables": 2000
+    }),
+    "fertilizers": MappingProxyType({
+        "npk": 3000,  # ₹/acre
+        "organic": 1500,
+        "micronutrients": 500
+    }),
+    "pesticides": MappingProxyType({
+        "insecticides": 1000,
+        "fungicides": 800,
+        "herbicides": 600
+    }),
+    "irrigation": MappingProxyType({
+        "electricity": 2000,
+        "diesel": 3000,
+        "labor": 1500
+    }),
+    "labor": MappingProxyType({
+        "sowing": 1000,
+        "weeding": 800,
+        "harvesting": 2000,
+        "threshing": 1500
+    }),
+    "machinery": MappingProxyType({
+        "tractor": 5000,
+        "harvester": 8000,
+        "thresher": 3000
+    }),
+    "miscellaneous": MappingProxyType({
+        "transport": 1000,
+        "storage": 500,
+        "marketing": 800
+    })
+})
+
+# Investment share spent at land prep, sowing, irrigation and harvest
+_EXPENSE_FRACTIONS = np.array([0.2, 0.3, 0.3, 0.2])
+
+# ROI weighting by risk level (lower risk = higher weight)
+_RISK_WEIGHTS = MappingProxyType({"Low": 1.0, "Medium": 0.8, "High": 0.6})
+
+# Financial-health verdicts by ROI band, picked via bisect
+_ROI_THRESHOLDS = (10.0, 20.0)
+_ROI_LABELS = (
+    "Low Return - Consider alternatives",
+    "Moderate Return - Acceptable",
+    "Good Return - Recommended"
+)
+
+# Sensitivity scenarios as (yield, price, cost) multiplier rows, evaluated
+# against every crop in a single broadcast
+_SCENARIO_NAMES = ("yield_reduction_20", "yield_reduction_40", "price_reduction_15",
+                   "price_reduction_30", "cost_increase_20", "cost_increase_40")
+_SCENARIO_MULT = np.array([
+    [0.8, 1.0, 1.0],
+    [0.6, 1.0, 1.0],
+    [1.0, 0.85, 1.0],
+    [1.0, 0.7, 1.0],
+    [1.0, 1.0, 1.2],
+    [1.0, 1.0, 1.4],
+])
+
+
+def _scenario_roi_kernel(investment, revenue, mult):
+    """ROI per sensitivity scenario from per-crop investment/revenue arrays.
+
+    mult is the (scenario, 3) yield/price/cost multiplier matrix; revenue
+    scales with the first two columns, cost with the third. Plain NumPy
+    broadcasting, numba-compiled when available.
+    """
+    total_revenue = (revenue * mult[:, 0:1] * mult[:, 1:2]).sum(axis=1)
+    total_cost = (investment * mult[:, 2:3]).sum(axis=1)
+    return np.where(total_cost > 0, (total_revenue - total_cost) / total_cost * 100, 0.0)
+
+
+def _emi_vec(principal, months, annual_rate):
+    """Closed-form monthly EMI; accepts scalars or arrays of parameters.
+
+    Pure arithmetic over floats so numba can compile it for batched loan
+    sweeps; zero-rate loans fall back to straight principal/months.
+    """
+    r = annual_rate / 12.0
+    c = (1.0 + r) ** months
+    denom = np.where(c > 1.0, c - 1.0, 1.0)
+    return np.where(c > 1.0, principal * r * c / denom, principal / months)
+
+
+if njit is not None:
+    _scenario_roi_kernel = njit(cache=True, fastmath=True)(_scenario_roi_kernel)
+    _emi_vec = njit(cache=True, fastmath=True)(_emi_vec)
+    # Warm the compile caches at import
+    _empty = np.empty(0)
+    _scenario_roi_kernel(_empty, _empty, _SCENARIO_MULT)
+    _emi_vec(_empty, _empty, _empty)
+    del _empty
 
 class FinancialPlanner:
     """Financial planning and analysis for crop farming."""
     
     def __init__(self):
-        self.cost_structures = self._initialize_cost_structures()
-    
-    def _initialize_cost_structures(self) -> Dict[str, Dict[str, float]]:
-        """Initialize cost structures for different farming activities."""
-        return {
-            "land_preparation": {
-                "plowing": 2000,  # ₹/acre
-                "harrowing": 1500,
-                "leveling": 1000,
-                "seed_bed": 500
-            },
-            "seeds": {
-                "wheat": 800,
-                "rice": 1200,
-                "maize": 600,
-                "cotton": 1500,
-                "sugarcane": 3000,
-                "pulses": 400,
-                "vegetables": 2000
-            },
-            "fertilizers": {
-                "npk": 3000,  # ₹/acre
-                "organic": 1500,
-                "micronutrients": 500
-            },
-            "pesticides": {
-                "insecticides": 1000,
-                "fungicides": 800,
-                "herbicides": 600
-            },
-            "irrigation": {
-                "electricity": 2000,
-                "diesel": 3000,
-                "labor": 1500
-            },
-            "labor": {
-                "sowing": 1000,
-                "weeding": 800,
-                "harvesting": 2000,
-                "threshing": 1500
-            },
-            "machinery": {
-                "tractor": 5000,
-                "harvester": 8000,
-                "thresher": 3000
-            },
-            "miscellaneous": {
-                "transport": 1000,
-                "storage": 500,
-                "marketing": 800
-            }
-        }
-    
+        self.cost_structures = _COST_STRUCTURES
+
     def analyze_financials(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
         """Comprehensive financial analysis for the farming plan."""
         
-        if not crop_recommendations.get('crops'):
+        crops = crop_recommendations.get('crops')
+        if not crops:
             return self._empty_financial_analysis()
-        
-        # Calculate total financial metrics
-        total_investment = sum(crop['investment'] for crop in crop_recommendations['crops'])
-        total_revenue = sum(crop['expected_revenue'] for crop in crop_recommendations['crops'])
-        total_profit = sum(crop['net_profit'] for crop in crop_recommendations['crops'])
-        
+
+        # Extract the numeric fields once; every total then falls out of a
+        # single vectorized reduction instead of separate genexpr passes
+        data = np.fromiter(
+            ((c['investment'], c['expected_revenue'], c['net_profit'], c['expected_yield'])
+             for c in crops),
+            dtype=np.dtype((np.float64, 4)), count=len(crops))
+        total_investment, total_revenue, total_profit, total_yield = data.sum(axis=0)
+
+
         # Calculate per-acre metrics
         total_acres = farmer_profile.total_acres
         investment_per_acre = total_investment / total_acres
@@ -81,13 +155,13 @@ class FinancialPlanner:
         profit_margin = (total_profit / total_revenue) * 100 if total_revenue > 0 else 0
         
         # Generate cash flow projections
-        cash_flow = self._generate_cash_flow(farmer_profile, crop_recommendations)
+        cash_flow = self._generate_cash_flow(crops)
         
-        # Break-even analysis
-        break_even_analysis = self._calculate_break_even(farmer_profile, crop_recommendations)
+        # Break-even analysis reuses the totals already computed above
+        break_even_analysis = self._calculate_break_even(total_investment, total_revenue, total_yield)
         
         # Risk-adjusted metrics
-        risk_adjusted_roi = self._calculate_risk_adjusted_roi(crop_recommendations)
+        risk_adjusted_roi = self._calculate_risk_adjusted_roi(crops)
         
         return {
             "total_investment": total_investment,
@@ -119,8 +193,8 @@ class FinancialPlanner:
             "profit_per_acre": 0,
             "roi": 0,
             "profit_margin": 0,
-            "monthly_expenses": [0] * 12,
-            "monthly_income": [0] * 12,
+            "monthly_expenses": np.zeros(12),
+            "monthly_income": np.zeros(12),
             "break_even_yield": 0,
             "break_even_price": 0,
             "safety_margin": 0,
@@ -129,39 +203,36 @@ class FinancialPlanner:
             "financial_health": "Unknown"
         }
     
-    def _generate_cash_flow(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
+    def _generate_cash_flow(self, crops) -> Dict[str, Any]:
         """Generate monthly cash flow projections."""
-        monthly_expenses = [0] * 12
-        monthly_income = [0] * 12
-        
+        monthly_expenses = np.zeros(12)
+        monthly_income = np.zeros(12)
+
         # Current month
         current_month = datetime.now().month - 1  # 0-indexed
-        
-        for crop in crop_recommendations['crops']:
+
+        for crop in crops:
             # Distribute expenses and income across months based on crop timeline
             crop_cash_flow = self._calculate_crop_cash_flow(crop, current_month)
-            
-            for month in range(12):
-                monthly_expenses[month] += crop_cash_flow['expenses'][month]
-                monthly_income[month] += crop_cash_flow['income'][month]
-        
-        # Calculate cash flow summary
-        total_expenses = sum(monthly_expenses)
-        total_income = sum(monthly_income)
+
+            monthly_expenses += crop_cash_flow['expenses']
+            monthly_income += crop_cash_flow['income']
+
+        # Calculate cash flow summary; plain floats at the dict boundary
+        total_expenses = float(monthly_expenses.sum())
+        total_income = float(monthly_income.sum())
         net_cash_flow = total_income - total_expenses
-        
+
         # Calculate monthly net cash flow
-        monthly_net = [income - expense for income, expense in zip(monthly_income, monthly_expenses)]
-        
+        monthly_net = monthly_income - monthly_expenses
+
         # Find peak cash requirement
-        cumulative_cash_flow = []
-        running_total = 0
-        for net in monthly_net:
-            running_total += net
-            cumulative_cash_flow.append(running_total)
-        
-        peak_cash_requirement = abs(min(cumulative_cash_flow)) if cumulative_cash_flow else 0
-        
+        cumulative_cash_flow = np.cumsum(monthly_net)
+
+        # Peak requirement is the deepest cumulative deficit; zero when the
+        # plan never goes cash-negative
+        peak_cash_requirement = max(0.0, -cumulative_cash_flow.min())
+
         return {
             "monthly_expenses": monthly_expenses,
             "monthly_income": monthly_income,
@@ -172,73 +243,67 @@ class FinancialPlanner:
                 "total_income": total_income,
                 "net_cash_flow": net_cash_flow,
                 "peak_cash_requirement": peak_cash_requirement,
-                "positive_months": len([x for x in monthly_net if x > 0]),
-                "negative_months": len([x for x in monthly_net if x < 0])
+                "positive_months": int((monthly_net > 0).sum()),
+                "negative_months": int((monthly_net < 0).sum())
             }
         }
     
-    def _calculate_crop_cash_flow(self, crop, start_month) -> Dict[str, List[float]]:
-        """Calculate cash flow for a specific crop."""
-        expenses = [0] * 12
-        income = [0] * 12
-        
-        # Get crop timeline
-        timeline = self._get_crop_timeline(crop)
-        
-        # Distribute expenses across timeline
-        total_investment = crop['investment']
-        expense_distribution = self._distribute_expenses(timeline, total_investment)
-        
-        for month, amount in expense_distribution.items():
-            actual_month = (start_month + month) % 12
-            expenses[actual_month] += amount
-        
-        # Distribute income (harvest)
-        harvest_month = (start_month + timeline['harvest']) % 12
-        income[harvest_month] += crop['expected_revenue']
-        
+    def _calculate_crop_cash_flow(self, crop, start_month) -> Dict[str, np.ndarray]:
+        """Calculate cash flow for a specific crop (memoized by its inputs)."""
+        expenses, income = self._crop_cash_flow_cached(
+            crop.get('growth_duration', 120), crop['investment'],
+            crop['expected_revenue'], start_month)
         return {
             "expenses": expenses,
             "income": income
         }
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _crop_cash_flow_cached(growth_duration, investment, revenue, start_month):
+        """Monthly expense/income vectors for one crop parameter tuple.
+
+        The same (duration, investment, revenue, month) combination recurs
+        across crops and sensitivity reruns, so the vectors are cached.
+        Callers must treat the returned arrays as read-only.
+        """
+        timeline = FinancialPlanner._get_crop_timeline(growth_duration)
+
+        # Scatter the staged expense amounts into their month slots in one
+        # np.add.at call; stages landing on the same month accumulate
+        months = np.array([timeline['land_prep'], timeline['sowing'],
+                           timeline['irrigation'], timeline['harvest']])
+        expenses = np.zeros(12)
+        np.add.at(expenses, (start_month + months) % 12, investment * _EXPENSE_FRACTIONS)
+
+        # Income arrives at harvest
+        income = np.zeros(12)
+        income[(start_month + timeline['harvest']) % 12] = revenue
+
+        return expenses, income
     
-    def _get_crop_timeline(self, crop) -> Dict[str, int]:
-        """Get timeline for crop activities based on growth duration."""
-        growth_duration = crop.get('growth_duration', 120)  # Default 120 days
-        
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _get_crop_timeline(growth_duration: int) -> Dict[str, int]:
+        """Get timeline for crop activities based on growth duration.
+
+        Pure function of the duration, so results are memoized across the
+        cash-flow and sensitivity passes.
+        """
         # Convert days to months (approximate)
         months = max(1, growth_duration // 30)
-        
+
         # Distribute activities across the timeline
-        timeline = {
+        return {
             "land_prep": 0,
             "sowing": 1,
             "irrigation": max(2, months // 3),
             "harvest": months
         }
-        
-        return timeline
-    
-    def _distribute_expenses(self, timeline, total_investment) -> Dict[int, float]:
-        """Distribute total investment across timeline months."""
-        distribution = {
-            timeline['land_prep']: total_investment * 0.2,
-            timeline['sowing']: total_investment * 0.3,
-            timeline['irrigation']: total_investment * 0.3,
-            timeline['harvest']: total_investment * 0.2
-        }
-        return distribution
     
-    def _calculate_break_even(self, farmer_profile, crop_recommendations) -> Dict[str, float]:
-        """Calculate break-even analysis."""
-        if not crop_recommendations.get('crops'):
-            return {"break_even_yield": 0, "break_even_price": 0, "safety_margin": 0}
-        
-        total_investment = sum(crop['investment'] for crop in crop_recommendations['crops'])
-        total_expected_revenue = sum(crop['expected_revenue'] for crop in crop_recommendations['crops'])
-        total_expected_yield = sum(float(crop['expected_yield']) for crop in crop_recommendations['crops'])
-        
-        # Calculate break-even metrics
+    def _calculate_break_even(self, total_investment, total_expected_revenue,
+                              total_expected_yield) -> Dict[str, float]:
+        """Calculate break-even analysis from pre-aggregated totals."""
         if total_expected_yield > 0:
             avg_price_per_ton = total_expected_revenue / total_expected_yield
             break_even_yield = total_investment / avg_price_per_ton
@@ -248,44 +313,34 @@ class FinancialPlanner:
             break_even_yield = 0
             break_even_price = 0
             safety_margin = 0
-        
+
         return {
             "break_even_yield": break_even_yield,
             "break_even_price": break_even_price,
             "safety_margin": safety_margin
         }
     
-    def _calculate_risk_adjusted_roi(self, crop_recommendations) -> float:
-        """Calculate risk-adjusted ROI."""
-        if not crop_recommendations.get('crops'):
+    def _calculate_risk_adjusted_roi(self, crops) -> float:
+        """Calculate risk-adjusted ROI as a weighted dot product."""
+        if not crops:
             return 0
-        
-        total_roi = 0
-        total_weight = 0
-        
-        for crop in crop_recommendations['crops']:
-            # Weight ROI by risk (lower risk = higher weight)
-            risk_weights = {"Low": 1.0, "Medium": 0.8, "High": 0.6}
-            weight = risk_weights.get(crop['risk_level'], 0.8)
-            
-            total_roi += crop['roi'] * weight
-            total_weight += weight
-        
-        return total_roi / total_weight if total_weight > 0 else 0
+
+        n = len(crops)
+        rois = np.fromiter((c['roi'] for c in crops), dtype=np.float64, count=n)
+        weights = np.fromiter((_RISK_WEIGHTS.get(c['risk_level'], 0.8) for c in crops),
+                              dtype=np.float64, count=n)
+
+        total_weight = weights.sum()
+        return float(np.vdot(rois, weights) / total_weight) if total_weight > 0 else 0
     
     def _assess_financial_health(self, farmer_profile, total_investment, roi) -> str:
         """Assess overall financial health of the farming plan."""
         # Check investment capacity
         if total_investment > farmer_profile.investment_capacity:
             return "High Risk - Investment exceeds capacity"
-        
-        # Check ROI
-        if roi < 10:
-            return "Low Return - Consider alternatives"
-        elif roi < 20:
-            return "Moderate Return - Acceptable"
-        else:
-            return "Good Return - Recommended"
+
+        # Verdict by ROI band
+        return _ROI_LABELS[bisect.bisect_right(_ROI_THRESHOLDS, roi)]
     
     def generate_financial_report(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
         """Generate comprehensive financial report."""
@@ -307,17 +362,18 @@ class FinancialPlanner:
     def _perform_sensitivity_analysis(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
         """Perform sensitivity analysis on key variables."""
         base_analysis = self.analyze_financials(farmer_profile, crop_recommendations)
-        
-        # Test different scenarios
-        scenarios = {
-            "yield_reduction_20": self._calculate_scenario_roi(crop_recommendations, yield_multiplier=0.8),
-            "yield_reduction_40": self._calculate_scenario_roi(crop_recommendations, yield_multiplier=0.6),
-            "price_reduction_15": self._calculate_scenario_roi(crop_recommendations, price_multiplier=0.85),
-            "price_reduction_30": self._calculate_scenario_roi(crop_recommendations, price_multiplier=0.7),
-            "cost_increase_20": self._calculate_scenario_roi(crop_recommendations, cost_multiplier=1.2),
-            "cost_increase_40": self._calculate_scenario_roi(crop_recommendations, cost_multiplier=1.4)
-        }
-        
+
+        crops = crop_recommendations.get('crops')
+        if not crops:
+            scenario_roi = np.zeros(len(_SCENARIO_NAMES))
+        else:
+            investment = np.array([c['investment'] for c in crops])
+            revenue = np.array([c['expected_revenue'] for c in crops])
+
+            scenario_roi = _scenario_roi_kernel(investment, revenue, _SCENARIO_MULT)
+
+        scenarios = dict(zip(_SCENARIO_NAMES, scenario_roi.tolist()))
+
         return {
             "base_roi": base_analysis['roi'],
             "scenarios": scenarios,
@@ -325,22 +381,6 @@ class FinancialPlanner:
             "best_case_roi": max(scenarios.values())
         }
     
-    def _calculate_scenario_roi(self, crop_recommendations, yield_multiplier=1.0, 
-                               price_multiplier=1.0, cost_multiplier=1.0) -> float:
-        """Calculate ROI for a specific scenario."""
-        if not crop_recommendations.get('crops'):
-            return 0
-        
-        total_investment = sum(crop['investment'] * cost_multiplier for crop in crop_recommendations['crops'])
-        total_revenue = sum(
-            float(crop['expected_yield']) * yield_multiplier * 
-            (crop['expected_revenue'] / float(crop['expected_yield'])) * price_multiplier 
-            for crop in crop_recommendations['crops']
-        )
-        
-        net_profit = total_revenue - total_investment
-        return (net_profit / total_investment) * 100 if total_investment > 0 else 0
-    
     def _generate_financing_recommendations(self, farmer_profile, financial_analysis) -> Dict[str, Any]:
         """Generate financing recommendations."""
         total_investment = financial_analysis['total_investment']
@@ -374,12 +414,7 @@ class FinancialPlanner:
     
     def _calculate_emi(self, principal, months, annual_rate) -> float:
         """Calculate monthly EMI."""
-        monthly_rate = annual_rate / 12
-        if monthly_rate == 0:
-            return principal / months
-        
-        emi = principal * (monthly_rate * (1 + monthly_rate)**months) / ((1 + monthly_rate)**months - 1)
-        return emi
+        return float(_emi_vec(float(principal), float(months), float(annual_rate)))
     
     def _suggest_risk_mitigation(self, financial_analysis) -> List[str]:
         """Suggest risk mitigation strategies based on financial analysis."""
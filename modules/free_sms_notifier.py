@@ -1,13 +1,69 @@
 from typing import Dict, List, Any, Optional
+import bisect
+import re
 import smtplib
+import sys
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from types import MappingProxyType
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Email-to-SMS gateways for major carriers, shared read-only by every
+# notifier; interned keys make the per-send carrier probe a pointer compare
+_SMS_GATEWAYS = MappingProxyType({sys.intern(k): v for k, v in {
+    # US Carriers
+    'verizon': '@vtext.com',
+    'att': '@txt.att.net',
+    'tmobile': '@tmomail.net',
+    'sprint': '@messaging.sprintpcs.com',
+    'boost': '@myboostmobile.com',
+    'cricket': '@mms.cricketwireless.net',
+    'metro': '@mymetropcs.com',
+    'uscellular': '@email.uscc.net',
+
+    # Indian Carriers
+    'airtel': '@airtelmail.com',
+    'vodafone': '@vodafone-sms.com',
+    'idea': '@ideacellular.net',
+    'bsnl': '@bsnl.in',
+    'mtnl': '@mtnl.net.in',
+    'jio': '@sms.jio.com',
+    'reliance': '@rcom.co.in',
+
+    # Generic gateways (work for many carriers)
+    'generic1': '@txt.att.net',
+    'generic2': '@vtext.com',
+    'generic3': '@tmomail.net'
+}.items()})
+_CARRIER_LIST = tuple(_SMS_GATEWAYS)
+
+# Strips formatting (spaces, dashes, +91 etc.) from phone numbers in C
+_NON_DIGIT_RE = re.compile(r'\D+')
+
+# Market advice by price-change band; bisect over the thresholds picks
+# the matching message without an if/elif ladder
+_MARKET_THRESHOLDS = (-10.0, -5.0, 5.0, 10.0)
+_MARKET_MESSAGES = (
+    "Significant drop. Evaluate selling strategy carefully.",
+    "Price decline. Consider selling if storage costs high.",
+    "Stable prices. Normal conditions.",
+    "Moderate increase. Monitor conditions.",
+    "Strong upward trend. Consider holding produce."
+)
+
+_ALERT_EMOJIS = MappingProxyType({
+    'weather': '🌦️',
+    'pest': '🐛',
+    'disease': '🦠',
+    'market': '📈',
+    'irrigation': '💧',
+    'emergency': '🚨'
+})
+
 class FreeSMSNotifier:
     """Free SMS notification system using email-to-SMS gateways."""
     
@@ -23,33 +79,39 @@ class FreeSMSNotifier:
         
         if not self.is_configured:
             print("⚠️ Free SMS not configured. Set EMAIL_ADDRESS and EMAIL_PASSWORD environment variables.")
-        
-        # Email-to-SMS gateways for major carriers
-        self.sms_gateways = {
-            # US Carriers
-            'verizon': '@vtext.com',
-            'att': '@txt.att.net',
-            'tmobile': '@tmomail.net',
-            'sprint': '@messaging.sprintpcs.com',
-            'boost': '@myboostmobile.com',
-            'cricket': '@mms.cricketwireless.net',
-            'metro': '@mymetropcs.com',
-            'uscellular': '@email.uscc.net',
-            
-            # Indian Carriers
-            'airtel': '@airtelmail.com',
-            'vodafone': '@vodafone-sms.com',
-            'idea': '@ideacellular.net',
-            'bsnl': '@bsnl.in',
-            'mtnl': '@mtnl.net.in',
-            'jio': '@sms.jio.com',
-            'reliance': '@rcom.co.in',
-            
-            # Generic gateways (work for many carriers)
-            'generic1': '@txt.att.net',
-            'generic2': '@vtext.com',
-            'generic3': '@tmomail.net'
-        }
+
+        self.sms_gateways = _SMS_GATEWAYS
+
+        # Cached SMTP connection, created lazily and reused across sends
+        self._server = None
+
+    def _get_server(self) -> smtplib.SMTP:
+        """Return a logged-in SMTP connection, reusing it across sends.
+
+        The TLS and auth handshake is paid once; subsequent messages go
+        over the same connection.
+        """
+        if self._server is None:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+            server.starttls()
+            server.login(self.email, self.password)
+            self._server = server
+        return self._server
+
+    def close(self):
+        """Close the cached SMTP connection, if any."""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def send_crop_report(self, phone_number: str, carrier: str, farmer_profile: Any, 
                         crop_recommendations: Dict, financial_analysis: Dict, 
@@ -136,7 +198,7 @@ class FreeSMSNotifier:
             gateway = self.sms_gateways[carrier]
             
             # Format the phone number (remove any non-digits)
-            clean_number = ''.join(filter(str.isdigit, phone_number))
+            clean_number = _NON_DIGIT_RE.sub('', phone_number)
             
             # Create the SMS email address
             sms_email = f"{clean_number}{gateway}"
@@ -149,123 +211,124 @@ class FreeSMSNotifier:
             
             # Add message body
             msg.attach(MIMEText(message, 'plain'))
-            
-            # Send the email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email, self.password)
-            
-            text = msg.as_string()
-            server.sendmail(self.email, sms_email, text)
-            server.quit()
-            
+
+            # Send over the shared connection. Servers drop idle sessions,
+            # so a failure on a cached connection gets one reconnect+retry
+            # before counting as a real error.
+            payload = msg.as_string()
+            was_cached = self._server is not None
+            try:
+                self._get_server().sendmail(self.email, sms_email, payload)
+            except (smtplib.SMTPException, OSError):
+                self.close()
+                if not was_cached:
+                    raise
+                self._get_server().sendmail(self.email, sms_email, payload)
+
             print(f"✅ Free SMS sent successfully to {phone_number} via {carrier}")
             return True
-            
+
         except Exception as e:
             print(f"Error in _send_sms: {e}")
+            # Drop any broken connection so the next send reconnects cleanly
+            self.close()
             return False
+
+    def send_bulk(self, recipients: List[tuple], messages: List[str]) -> List[bool]:
+        """Send many SMS messages over one SMTP connection.
+
+        recipients is a list of (phone_number, carrier) pairs matched
+        one-to-one with messages; the TLS/login handshake is amortized
+        across the whole batch.
+        """
+        if not self.is_configured:
+            return [False] * len(messages)
+
+        return [self._send_sms(number, carrier, message)
+                for (number, carrier), message in zip(recipients, messages)]
     
     def _format_crop_report_sms(self, farmer_profile: Any, crop_recommendations: Dict, 
                                financial_analysis: Dict, risk_analysis: Dict) -> str:
         """Format crop planning report for SMS (shorter format)."""
-        message = f"Crop Plan for {farmer_profile.name}\n"
-        message += f"Location: {farmer_profile.state}\n"
-        message += f"Land: {farmer_profile.total_acres} acres\n\n"
-        
-        # Top crop recommendation
-        if crop_recommendations.get('crops'):
-            top_crop = crop_recommendations['crops'][0]
-            message += f"Top Crop: {top_crop['name']}\n"
-            message += f"Yield: {top_crop['expected_yield']} tons/acre\n"
-            message += f"Investment: ₹{top_crop['investment']:,.0f}\n"
-            message += f"ROI: {top_crop['roi']:.1f}%\n"
-            message += f"Risk: {top_crop['risk_level']}\n\n"
-        
-        # Financial summary
-        message += f"Total Investment: ₹{financial_analysis.get('total_investment', 0):,.0f}\n"
-        message += f"Expected Revenue: ₹{financial_analysis.get('total_revenue', 0):,.0f}\n"
-        message += f"Net Profit: ₹{financial_analysis.get('net_profit', 0):,.0f}\n"
-        message += f"Overall ROI: {financial_analysis.get('roi', 0):.1f}%\n\n"
-        
-        # Risk assessment
-        message += f"Risk Level: {risk_analysis.get('overall_risk', 'Unknown')}\n"
-        message += f"Risk Score: {risk_analysis.get('risk_score', 0):.1f}\n\n"
-        
-        message += f"Generated: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
-        
-        return message
+        crops = crop_recommendations.get('crops')
+        if crops:
+            top_crop = crops[0]
+            top_crop_block = (
+                f"Top Crop: {top_crop['name']}\n"
+                f"Yield: {top_crop['expected_yield']:.2f} tons/acre\n"
+                f"Investment: ₹{top_crop['investment']:,.0f}\n"
+                f"ROI: {top_crop['roi']:.1f}%\n"
+                f"Risk: {top_crop['risk_level']}\n\n"
+            )
+        else:
+            top_crop_block = ""
+
+        return (
+            f"Crop Plan for {farmer_profile.name}\n"
+            f"Location: {farmer_profile.state}\n"
+            f"Land: {farmer_profile.total_acres} acres\n\n"
+            f"{top_crop_block}"
+            f"Total Investment: ₹{financial_analysis.get('total_investment', 0):,.0f}\n"
+            f"Expected Revenue: ₹{financial_analysis.get('total_revenue', 0):,.0f}\n"
+            f"Net Profit: ₹{financial_analysis.get('net_profit', 0):,.0f}\n"
+            f"Overall ROI: {financial_analysis.get('roi', 0):.1f}%\n\n"
+            f"Risk Level: {risk_analysis.get('overall_risk', 'Unknown')}\n"
+            f"Risk Score: {risk_analysis.get('risk_score', 0):.1f}\n\n"
+            f"Generated: {datetime.now():%d/%m/%Y %H:%M}"
+        )
     
     def _format_alert_sms(self, alert_type: str, message: str) -> str:
         """Format alert message for SMS."""
-        emoji_map = {
-            'weather': '🌦️',
-            'pest': '🐛',
-            'disease': '🦠',
-            'market': '📈',
-            'irrigation': '💧',
-            'emergency': '🚨'
-        }
-        
-        emoji = emoji_map.get(alert_type.lower(), '⚠️')
-        
-        formatted_message = f"{emoji} {alert_type.upper()} ALERT\n\n"
-        formatted_message += f"{message}\n\n"
-        formatted_message += f"Time: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
-        
-        return formatted_message
+        emoji = _ALERT_EMOJIS.get(alert_type.lower(), '⚠️')
+
+        return (
+            f"{emoji} {alert_type.upper()} ALERT\n\n"
+            f"{message}\n\n"
+            f"Time: {datetime.now():%d/%m/%Y %H:%M}"
+        )
     
     def _format_reminder_sms(self, crop_name: str, activity: str, due_date: str) -> str:
         """Format farming activity reminder for SMS."""
-        message = f"🌱 FARMING REMINDER\n\n"
-        message += f"Crop: {crop_name}\n"
-        message += f"Activity: {activity}\n"
-        message += f"Due: {due_date}\n\n"
-        message += f"Don't forget this important farming activity for optimal results!"
-        
-        return message
+        return (
+            f"🌱 FARMING REMINDER\n\n"
+            f"Crop: {crop_name}\n"
+            f"Activity: {activity}\n"
+            f"Due: {due_date}\n\n"
+            f"Don't forget this important farming activity for optimal results!"
+        )
     
     def _format_weather_alert_sms(self, weather_data: Dict) -> str:
         """Format weather alert for SMS."""
-        message = f"🌦️ WEATHER ALERT\n\n"
-        message += f"Temp: {weather_data.get('temperature', 'N/A')}\n"
-        message += f"Humidity: {weather_data.get('humidity', 'N/A')}\n"
-        message += f"Rainfall: {weather_data.get('rainfall', 'N/A')}\n"
-        message += f"Wind: {weather_data.get('wind_speed', 'N/A')}\n\n"
-        message += f"Recommendations:\n{weather_data.get('recommendations', 'Monitor conditions')}\n\n"
-        message += f"Precautions:\n{weather_data.get('precautions', 'Take necessary precautions')}"
-        
-        return message
+        return (
+            f"🌦️ WEATHER ALERT\n\n"
+            f"Temp: {weather_data.get('temperature', 'N/A')}\n"
+            f"Humidity: {weather_data.get('humidity', 'N/A')}\n"
+            f"Rainfall: {weather_data.get('rainfall', 'N/A')}\n"
+            f"Wind: {weather_data.get('wind_speed', 'N/A')}\n\n"
+            f"Recommendations:\n{weather_data.get('recommendations', 'Monitor conditions')}\n\n"
+            f"Precautions:\n{weather_data.get('precautions', 'Take necessary precautions')}"
+        )
     
     def _format_market_update_sms(self, crop_name: str, current_price: float, price_change: float) -> str:
         """Format market update for SMS."""
         change_emoji = "📈" if price_change >= 0 else "📉"
         change_text = f"+{price_change:.2f}" if price_change >= 0 else f"{price_change:.2f}"
-        
-        message = f"📊 MARKET UPDATE\n\n"
-        message += f"Crop: {crop_name}\n"
-        message += f"Price: ₹{current_price:,.2f}/ton\n"
-        message += f"Change: {change_emoji} {change_text}%\n\n"
-        message += f"Recommendation:\n{self._get_market_recommendation(price_change)}"
-        
-        return message
+
+        return (
+            f"📊 MARKET UPDATE\n\n"
+            f"Crop: {crop_name}\n"
+            f"Price: ₹{current_price:,.2f}/ton\n"
+            f"Change: {change_emoji} {change_text}%\n\n"
+            f"Recommendation:\n{self._get_market_recommendation(price_change)}"
+        )
     
     def _get_market_recommendation(self, price_change: float) -> str:
         """Get market recommendation based on price change."""
-        if price_change > 10:
-            return "Strong upward trend. Consider holding produce."
-        elif price_change > 5:
-            return "Moderate increase. Monitor conditions."
-        elif price_change > -5:
-            return "Stable prices. Normal conditions."
-        elif price_change > -10:
-            return "Price decline. Consider selling if storage costs high."
-        else:
-            return "Significant drop. Evaluate selling strategy carefully."
+        return _MARKET_MESSAGES[bisect.bisect_left(_MARKET_THRESHOLDS, price_change)]
     
-    def get_available_carriers(self) -> List[str]:
-        """Get list of available carriers."""
-        return list(self.sms_gateways.keys())
+    def get_available_carriers(self) -> tuple:
+        """Get the supported carriers."""
+        return _CARRIER_LIST
     
     def test_connection(self) -> bool:
         """Test email connection."""
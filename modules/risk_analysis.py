@@ -1,443 +1,503 @@
-from typing import Dict, List, Any
-import random
-from datetime import datetime, timedelta
-
-class RiskAnalyzer:
-    """Risk analysis system for crop planning and farming decisions."""
-    
-    def __init__(self):
-        self.risk_factors = self._initialize_risk_factors()
-    
-    def _initialize_risk_factors(self) -> Dict[str, Dict[str, Any]]:
-        """Initialize risk factors database."""
-        return {
-            "disease": {
-                "wheat": {"probability": 0.3, "impact": "Medium", "mitigation": "Fungicide application"},
-                "rice": {"probability": 0.4, "impact": "High", "mitigation": "Resistant varieties"},
-                "maize": {"probability": 0.25, "impact": "Medium", "mitigation": "Crop rotation"},
-                "cotton": {"probability": 0.5, "impact": "High", "mitigation": "IPM practices"},
-                "sugarcane": {"probability": 0.2, "impact": "Medium", "mitigation": "Healthy seed"},
-                "pulses": {"probability": 0.15, "impact": "Low", "mitigation": "Seed treatment"},
-                "vegetables": {"probability": 0.6, "impact": "High", "mitigation": "Greenhouse"}
-            },
-            "pest": {
-                "wheat": {"probability": 0.2, "impact": "Low", "mitigation": "Natural predators"},
-                "rice": {"probability": 0.35, "impact": "Medium", "mitigation": "Pest-resistant varieties"},
-                "maize": {"probability": 0.3, "impact": "Medium", "mitigation": "Biological control"},
-                "cotton": {"probability": 0.6, "impact": "High", "mitigation": "IPM strategies"},
-                "sugarcane": {"probability": 0.15, "impact": "Low", "mitigation": "Clean cultivation"},
-                "pulses": {"probability": 0.25, "impact": "Medium", "mitigation": "Crop rotation"},
-                "vegetables": {"probability": 0.7, "impact": "High", "mitigation": "Integrated pest management"}
-            },
-            "weather": {
-                "drought": {"probability": 0.25, "impact": "High", "mitigation": "Irrigation backup"},
-                "flood": {"probability": 0.15, "impact": "High", "mitigation": "Drainage systems"},
-                "hailstorm": {"probability": 0.1, "impact": "Medium", "mitigation": "Crop insurance"},
-                "frost": {"probability": 0.2, "impact": "Medium", "mitigation": "Frost protection"}
-            },
-            "market": {
-                "price_volatility": {"probability": 0.4, "impact": "Medium", "mitigation": "Forward contracts"},
-                "demand_fluctuation": {"probability": 0.3, "impact": "Medium", "mitigation": "Market diversification"},
-                "supply_chain": {"probability": 0.2, "impact": "Low", "mitigation": "Local markets"}
-            },
-            "water": {
-                "shortage": {"probability": 0.3, "impact": "High", "mitigation": "Water conservation"},
-                "quality": {"probability": 0.15, "impact": "Medium", "mitigation": "Water testing"},
-                "access": {"probability": 0.2, "impact": "Medium", "mitigation": "Multiple sources"}
-            },
-            "soil": {
-                "fertility_decline": {"probability": 0.25, "impact": "Medium", "mitigation": "Soil testing"},
-                "erosion": {"probability": 0.2, "impact": "Medium", "mitigation": "Contour farming"},
-                "salinity": {"probability": 0.15, "impact": "High", "mitigation": "Soil reclamation"}
-            }
-        }
-    
-    def analyze_risks(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
-        """Comprehensive risk analysis for the farming plan."""
-        
-        # Analyze individual risk categories
-        disease_risk = self._analyze_disease_risk(farmer_profile, crop_recommendations)
-        pest_risk = self._analyze_pest_risk(farmer_profile, crop_recommendations)
-        weather_risk = self._analyze_weather_risk(farmer_profile)
-        market_risk = self._analyze_market_risk(farmer_profile, crop_recommendations)
-        water_risk = self._analyze_water_risk(farmer_profile)
-        soil_risk = self._analyze_soil_risk(farmer_profile)
-        
-        # Calculate overall risk metrics
-        overall_risk = self._calculate_overall_risk([
-            disease_risk, pest_risk, weather_risk, market_risk, water_risk, soil_risk
-        ])
-        
-        # Economic risk analysis
-        economic_risk = self._analyze_economic_risk(farmer_profile, crop_recommendations)
-        
-        # Environmental risk analysis
-        environmental_risk = self._analyze_environmental_risk(farmer_profile, crop_recommendations)
-        
-        # Risk tolerance analysis
-        tolerance_analysis = self._analyze_risk_tolerance(farmer_profile, overall_risk)
-        
-        return {
-            "overall_risk": overall_risk["level"],
-            "risk_score": overall_risk["score"],
-            "disease_risk": disease_risk,
-            "pest_risk": pest_risk,
-            "weather_risk": weather_risk,
-            "market_risk": market_risk,
-            "water_risk": water_risk,
-            "soil_risk": soil_risk,
-            "economic_risk": economic_risk["level"],
-            "economic_risk_score": economic_risk["score"],
-            "environmental_risk": environmental_risk["level"],
-            "environmental_risk_score": environmental_risk["score"],
-            "tolerance_analysis": tolerance_analysis,
-            "risk_mitigation_strategies": self._generate_mitigation_strategies([
-                disease_risk, pest_risk, weather_risk, market_risk, water_risk, soil_risk
-            ])
-        }
-    
-    def _analyze_disease_risk(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
-        """Analyze disease risk for recommended crops."""
-        if not crop_recommendations.get('crops'):
-            return {"level": "Unknown", "probability": 0, "impact": "Unknown", "mitigation": "N/A", "insurance": False}
-        
-        total_risk = 0
-        crop_count = len(crop_recommendations['crops'])
-        
-        for crop in crop_recommendations['crops']:
-            crop_key = crop['name'].lower().split()[0]  # Get first word of crop name
-            if crop_key in self.risk_factors["disease"]:
-                risk_data = self.risk_factors["disease"][crop_key]
-                total_risk += risk_data["probability"]
-        
-        avg_risk = total_risk / crop_count if crop_count > 0 else 0
-        
-        # Determine risk level
-        if avg_risk < 0.2:
-            risk_level = "Low"
-        elif avg_risk < 0.4:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "level": risk_level,
-            "probability": avg_risk * 100,
-            "impact": "Medium" if avg_risk > 0.3 else "Low",
-            "mitigation": "Regular monitoring and preventive measures",
-            "insurance": True
-        }
-    
-    def _analyze_pest_risk(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
-        """Analyze pest risk for recommended crops."""
-        if not crop_recommendations.get('crops'):
-            return {"level": "Unknown", "probability": 0, "impact": "Unknown", "mitigation": "N/A", "insurance": False}
-        
-        total_risk = 0
-        crop_count = len(crop_recommendations['crops'])
-        
-        for crop in crop_recommendations['crops']:
-            crop_key = crop['name'].lower().split()[0]
-            if crop_key in self.risk_factors["pest"]:
-                risk_data = self.risk_factors["pest"][crop_key]
-                total_risk += risk_data["probability"]
-        
-        avg_risk = total_risk / crop_count if crop_count > 0 else 0
-        
-        if avg_risk < 0.25:
-            risk_level = "Low"
-        elif avg_risk < 0.45:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "level": risk_level,
-            "probability": avg_risk * 100,
-            "impact": "Medium" if avg_risk > 0.35 else "Low",
-            "mitigation": "Integrated Pest Management (IPM)",
-            "insurance": True
-        }
-    
-    def _analyze_weather_risk(self, farmer_profile) -> Dict[str, Any]:
-        """Analyze weather-related risks based on location and season."""
-        location_profile = farmer_profile.get_location_profile()
-        
-        # Base weather risk based on region
-        regional_weather_risk = {
-            "North-West": 0.3,  # Punjab, Haryana - moderate weather risk
-            "North": 0.4,       # UP - higher weather variability
-            "West": 0.35,       # Maharashtra - monsoon dependent
-            "South": 0.25       # Karnataka, TN - more stable weather
-        }
-        
-        base_risk = regional_weather_risk.get(location_profile["region"], 0.3)
-        
-        # Adjust for irrigation coverage
-        irrigation_coverage = farmer_profile.irrigated_acres / farmer_profile.total_acres
-        if irrigation_coverage > 0.8:
-            base_risk *= 0.7
-        elif irrigation_coverage > 0.5:
-            base_risk *= 0.85
-        
-        if base_risk < 0.25:
-            risk_level = "Low"
-        elif base_risk < 0.4:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "level": risk_level,
-            "probability": base_risk * 100,
-            "impact": "High" if base_risk > 0.35 else "Medium",
-            "mitigation": "Weather monitoring and contingency planning",
-            "insurance": True
-        }
-    
-    def _analyze_market_risk(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
-        """Analyze market-related risks."""
-        # Base market risk
-        base_risk = 0.35
-        
-        # Adjust based on crop diversity
-        if crop_recommendations.get('crops'):
-            crop_diversity = len(set(crop['category'] for crop in crop_recommendations['crops']))
-            if crop_diversity > 3:
-                base_risk *= 0.8  # More diversity reduces market risk
-            elif crop_diversity == 1:
-                base_risk *= 1.2  # Single crop category increases risk
-        
-        # Adjust based on farmer's financial position
-        if farmer_profile.debt_to_income_ratio > 0.5:
-            base_risk *= 1.3  # High debt increases market risk
-        
-        if base_risk < 0.3:
-            risk_level = "Low"
-        elif base_risk < 0.5:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "level": risk_level,
-            "probability": base_risk * 100,
-            "impact": "Medium",
-            "mitigation": "Market diversification and forward contracts",
-            "insurance": False
-        }
-    
-    def _analyze_water_risk(self, farmer_profile) -> Dict[str, Any]:
-        """Analyze water availability and quality risks."""
-        irrigation_coverage = farmer_profile.irrigated_acres / farmer_profile.total_acres
-        
-        # Base water risk
-        if irrigation_coverage < 0.3:
-            base_risk = 0.6
-        elif irrigation_coverage < 0.6:
-            base_risk = 0.4
-        else:
-            base_risk = 0.25
-        
-        # Adjust based on irrigation type
-        irrigation_type_risk = {
-            "Well": 0.3,
-            "Canal": 0.2,
-            "Borewell": 0.4,
-            "Rainfed": 0.7,
-            "Mixed": 0.25
-        }
-        
-        type_risk = irrigation_type_risk.get(farmer_profile.irrigation_type, 0.4)
-        base_risk = (base_risk + type_risk) / 2
-        
-        if base_risk < 0.3:
-            risk_level = "Low"
-        elif base_risk < 0.5:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "level": risk_level,
-            "probability": base_risk * 100,
-            "impact": "High" if base_risk > 0.4 else "Medium",
-            "mitigation": "Water conservation and multiple sources",
-            "insurance": False
-        }
-    
-    def _analyze_soil_risk(self, farmer_profile) -> Dict[str, Any]:
-        """Analyze soil-related risks."""
-        # Base soil risk based on soil type
-        soil_risk_factors = {
-            "Clay": 0.3,
-            "Sandy": 0.4,
-            "Loamy": 0.2,
-            "Red Soil": 0.35,
-            "Black Soil": 0.25,
-            "Alluvial": 0.2
-        }
-        
-        base_risk = soil_risk_factors.get(farmer_profile.soil_type, 0.3)
-        
-        # Adjust based on experience (more experience = better soil management)
-        if farmer_profile.experience_years > 15:
-            base_risk *= 0.8
-        elif farmer_profile.experience_years < 5:
-            base_risk *= 1.2
-        
-        if base_risk < 0.25:
-            risk_level = "Low"
-        elif base_risk < 0.4:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "level": risk_level,
-            "probability": base_risk * 100,
-            "impact": "Medium",
-            "mitigation": "Soil testing and organic matter management",
-            "insurance": False
-        }
-    
-    def _calculate_overall_risk(self, risk_categories) -> Dict[str, Any]:
-        """Calculate overall risk from all categories."""
-        if not risk_categories:
-            return {"level": "Unknown", "score": 0}
-        
-        # Weight different risk categories
-        weights = {
-            "disease": 0.2,
-            "pest": 0.15,
-            "weather": 0.25,
-            "market": 0.2,
-            "water": 0.15,
-            "soil": 0.05
-        }
-        
-        total_weighted_risk = 0
-        total_weight = 0
-        
-        for i, risk in enumerate(risk_categories):
-            weight = list(weights.values())[i] if i < len(weights) else 0.1
-            risk_score = risk["probability"] / 100  # Convert percentage to decimal
-            total_weighted_risk += risk_score * weight
-            total_weight += weight
-        
-        overall_risk_score = total_weighted_risk / total_weight if total_weight > 0 else 0
-        
-        if overall_risk_score < 0.3:
-            risk_level = "Low"
-        elif overall_risk_score < 0.5:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "level": risk_level,
-            "score": overall_risk_score
-        }
-    
-    def _analyze_economic_risk(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
-        """Analyze economic risks based on financial profile."""
-        # Calculate economic risk factors
-        debt_risk = min(1.0, farmer_profile.debt_to_income_ratio * 2)
-        investment_risk = 1.0 - (farmer_profile.investment_capacity / farmer_profile.annual_income)
-        cash_flow_risk = 1.0 - (farmer_profile.savings / farmer_profile.annual_income)
-        
-        # Weighted economic risk
-        economic_risk_score = (debt_risk * 0.4 + investment_risk * 0.3 + cash_flow_risk * 0.3)
-        
-        if economic_risk_score < 0.3:
-            risk_level = "Low"
-        elif economic_risk_score < 0.6:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "level": risk_level,
-            "score": economic_risk_score
-        }
-    
-    def _analyze_environmental_risk(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
-        """Analyze environmental risks."""
-        # Combine weather, water, and soil risks
-        weather_risk = self._analyze_weather_risk(farmer_profile)
-        water_risk = self._analyze_water_risk(farmer_profile)
-        soil_risk = self._analyze_soil_risk(farmer_profile)
-        
-        environmental_risk_score = (
-            weather_risk["probability"] * 0.4 +
-            water_risk["probability"] * 0.4 +
-            soil_risk["probability"] * 0.2
-        ) / 100
-        
-        if environmental_risk_score < 0.3:
-            risk_level = "Low"
-        elif environmental_risk_score < 0.5:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "level": risk_level,
-            "score": environmental_risk_score
-        }
-    
-    def _analyze_risk_tolerance(self, farmer_profile, overall_risk) -> Dict[str, Any]:
-        """Analyze compatibility between farmer's risk tolerance and overall risk."""
-        risk_tolerance_scores = {"Low": 0.3, "Medium": 0.5, "High": 0.7}
-        farmer_tolerance = risk_tolerance_scores.get(farmer_profile.risk_tolerance, 0.5)
-        
-        # Calculate compatibility
-        risk_gap = abs(overall_risk["score"] - farmer_tolerance)
-        compatibility_score = max(0, 100 - (risk_gap * 100))
-        
-        # Determine recommended risk level
-        if overall_risk["score"] > farmer_tolerance + 0.2:
-            recommended_risk = "Lower risk crops recommended"
-        elif overall_risk["score"] < farmer_tolerance - 0.2:
-            recommended_risk = "Higher return crops possible"
-        else:
-            recommended_risk = "Current plan suitable"
-        
-        # Calculate financial tolerance
-        max_loss_tolerance = farmer_profile.savings * 0.3
-        min_profit_target = farmer_profile.annual_income * 0.1
-        
-        return {
-            "recommended_risk": recommended_risk,
-            "compatibility_score": compatibility_score,
-            "max_loss_tolerance": max_loss_tolerance,
-            "min_profit_target": min_profit_target,
-            "adjusted_recommendation": self._get_adjusted_recommendation(overall_risk["score"], farmer_tolerance)
-        }
-    
-    def _get_adjusted_recommendation(self, actual_risk, tolerance) -> str:
-        """Get adjusted recommendation based on risk tolerance."""
-        if actual_risk > tolerance + 0.2:
-            return "Consider lower-risk crops or insurance"
-        elif actual_risk < tolerance - 0.2:
-            return "Can consider higher-return, higher-risk options"
-        else:
-            return "Current plan aligns with risk tolerance"
-    
-    def _generate_mitigation_strategies(self, risk_categories) -> List[str]:
-        """Generate mitigation strategies for identified risks."""
-        strategies = []
-        
-        for risk in risk_categories:
-            if risk["level"] in ["Medium", "High"]:
-                strategies.append(f"{risk['mitigation']} for {risk['level']} risk")
-        
-        # Add general strategies
-        strategies.extend([
-            "Regular monitoring and early warning systems",
-            "Crop insurance for high-risk scenarios",
-            "Diversification of crops and income sources",
-            "Building financial reserves for emergencies"
-        ])
-        
-        return list(set(strategies))  # Remove duplicates
+from typing import Dict, List, Any
+import functools
+import numpy as np
+from types import MappingProxyType
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel runs fine without it
+    njit = None
+
+# Static lookup tables shared read-only by every analyzer instance
+_REGIONAL_WEATHER_RISK = MappingProxyType({
+    "North-West": 0.3,  # Punjab, Haryana - moderate weather risk
+    "North": 0.4,       # UP - higher weather variability
+    "West": 0.35,       # Maharashtra - monsoon dependent
+    "South": 0.25       # Karnataka, TN - more stable weather
+})
+
+_IRRIGATION_TYPE_RISK = MappingProxyType({
+    "Well": 0.3,
+    "Canal": 0.2,
+    "Borewell": 0.4,
+    "Rainfed": 0.7,
+    "Mixed": 0.25
+})
+
+_SOIL_RISK_FACTORS = MappingProxyType({
+    "Clay": 0.3,
+    "Sandy": 0.4,
+    "Loamy": 0.2,
+    "Red Soil": 0.35,
+    "Black Soil": 0.25,
+    "Alluvial": 0.2
+})
+
+# Id tables and array forms of the dicts above for the numeric kernel;
+# the last array slot holds the default for unknown keys
+_REGION_IDS = {name: i for i, name in enumerate(_REGIONAL_WEATHER_RISK)}
+_REGIONAL_WEATHER_ARR = np.array(
+    list(_REGIONAL_WEATHER_RISK.values()) + [0.3], dtype=np.float32)
+_IRRIGATION_TYPE_IDS = {name: i for i, name in enumerate(_IRRIGATION_TYPE_RISK)}
+_IRRIGATION_RISK_ARR = np.array(
+    list(_IRRIGATION_TYPE_RISK.values()) + [0.4], dtype=np.float32)
+_SOIL_IDS = {name: i for i, name in enumerate(_SOIL_RISK_FACTORS)}
+_SOIL_RISK_ARR = np.array(
+    list(_SOIL_RISK_FACTORS.values()) + [0.3], dtype=np.float32)
+
+# Per-category tables for the fused risk pipeline, all indexed in the
+# same fixed order: disease, pest, weather, market, water, soil
+_OVERALL_WEIGHTS = (0.2, 0.15, 0.25, 0.2, 0.15, 0.05)
+
+# Low/Medium band cut-offs per category (scores >= the second column are High)
+_CATEGORY_BANDS = np.array([
+    [0.2, 0.4],    # disease
+    [0.25, 0.45],  # pest
+    [0.25, 0.4],   # weather
+    [0.3, 0.5],    # market
+    [0.3, 0.5],    # water
+    [0.25, 0.4],   # soil
+], dtype=np.float32)
+
+# Impact label flips from _IMPACT_BELOW to _IMPACT_ABOVE past this score;
+# -1 marks categories with a fixed impact
+_IMPACT_THRESHOLDS = np.array([0.3, 0.35, 0.35, -1.0, 0.4, -1.0], dtype=np.float32)
+_IMPACT_ABOVE = ("Medium", "Medium", "High", "Medium", "High", "Medium")
+_IMPACT_BELOW = ("Low", "Low", "Medium", "Medium", "Medium", "Medium")
+
+_CATEGORY_MITIGATIONS = (
+    "Regular monitoring and preventive measures",
+    "Integrated Pest Management (IPM)",
+    "Weather monitoring and contingency planning",
+    "Market diversification and forward contracts",
+    "Water conservation and multiple sources",
+    "Soil testing and organic matter management"
+)
+_CATEGORY_INSURED = (True, True, True, False, False, False)
+
+_UNKNOWN_RISK = MappingProxyType(
+    {"level": "Unknown", "probability": 0, "impact": "Unknown", "mitigation": "N/A", "insurance": False})
+
+_RISK_TOLERANCE_SCORES = MappingProxyType({"Low": 0.3, "Medium": 0.5, "High": 0.7})
+
+# Suffix per actionable level; doubles as the Medium/High membership test
+_RISK_SUFFIX = MappingProxyType({"Medium": " for Medium risk", "High": " for High risk"})
+
+_GENERAL_STRATEGIES = (
+    "Regular monitoring and early warning systems",
+    "Crop insurance for high-risk scenarios",
+    "Diversification of crops and income sources",
+    "Building financial reserves for emergencies"
+)
+
+_LEVELS = ("Low", "Medium", "High")
+
+def _level(score: float, low: float, medium: float) -> str:
+    """Map a risk score to Low/Medium/High given the two band cut-offs.
+
+    Branch-free equivalent of the former if/elif ladders: scores below
+    `low` are Low, below `medium` are Medium, the rest High.
+    """
+    return _LEVELS[(score >= low) + (score >= medium)]
+
+@functools.lru_cache(maxsize=512)
+def _tolerance_assessment(risk_pct: int, tolerance_pct: int):
+    """Compatibility score and recommendation strings for a risk/tolerance
+    pair quantized to whole percent.
+
+    Tolerance takes only three values and risk scores cluster, so the
+    cache absorbs almost every call after warm-up.
+    """
+    gap = risk_pct - tolerance_pct
+    if gap > 20:
+        recommended = "Lower risk crops recommended"
+        adjusted = "Consider lower-risk crops or insurance"
+    elif gap < -20:
+        recommended = "Higher return crops possible"
+        adjusted = "Can consider higher-return, higher-risk options"
+    else:
+        recommended = "Current plan suitable"
+        adjusted = "Current plan aligns with risk tolerance"
+
+    compatibility = max(0, 100 - abs(gap))
+    return recommended, adjusted, compatibility
+
+def _build_risk_factors() -> Dict[str, Dict[str, Any]]:
+    """Build the static risk factors database (module-level, built once)."""
+    return {
+        "disease": {
+            "wheat": {"probability": 0.3, "impact": "Medium", "mitigation": "Fungicide application"},
+            "rice": {"probability": 0.4, "impact": "High", "mitigation": "Resistant varieties"},
+            "maize": {"probability": 0.25, "impact": "Medium", "mitigation": "Crop rotation"},
+            "cotton": {"probability": 0.5, "impact": "High", "mitigation": "IPM practices"},
+            "sugarcane": {"probability": 0.2, "impact": "Medium", "mitigation": "Healthy seed"},
+            "pulses": {"probability": 0.15, "impact": "Low", "mitigation": "Seed treatment"},
+            "vegetables": {"probability": 0.6, "impact": "High", "mitigation": "Greenhouse"}
+        },
+        "pest": {
+            "wheat": {"probability": 0.2, "impact": "Low", "mitigation": "Natural predators"},
+            "rice": {"probability": 0.35, "impact": "Medium", "mitigation": "Pest-resistant varieties"},
+            "maize": {"probability": 0.3, "impact": "Medium", "mitigation": "Biological control"},
+            "cotton": {"probability": 0.6, "impact": "High", "mitigation": "IPM strategies"},
+            "sugarcane": {"probability": 0.15, "impact": "Low", "mitigation": "Clean cultivation"},
+            "pulses": {"probability": 0.25, "impact": "Medium", "mitigation": "Crop rotation"},
+            "vegetables": {"probability": 0.7, "impact": "High", "mitigation": "Integrated pest management"}
+        },
+        "weather": {
+            "drought": {"probability": 0.25, "impact": "High", "mitigation": "Irrigation backup"},
+            "flood": {"probability": 0.15, "impact": "High", "mitigation": "Drainage systems"},
+            "hailstorm": {"probability": 0.1, "impact": "Medium", "mitigation": "Crop insurance"},
+            "frost": {"probability": 0.2, "impact": "Medium", "mitigation": "Frost protection"}
+        },
+        "market": {
+            "price_volatility": {"probability": 0.4, "impact": "Medium", "mitigation": "Forward contracts"},
+            "demand_fluctuation": {"probability": 0.3, "impact": "Medium", "mitigation": "Market diversification"},
+            "supply_chain": {"probability": 0.2, "impact": "Low", "mitigation": "Local markets"}
+        },
+        "water": {
+            "shortage": {"probability": 0.3, "impact": "High", "mitigation": "Water conservation"},
+            "quality": {"probability": 0.15, "impact": "Medium", "mitigation": "Water testing"},
+            "access": {"probability": 0.2, "impact": "Medium", "mitigation": "Multiple sources"}
+        },
+        "soil": {
+            "fertility_decline": {"probability": 0.25, "impact": "Medium", "mitigation": "Soil testing"},
+            "erosion": {"probability": 0.2, "impact": "Medium", "mitigation": "Contour farming"},
+            "salinity": {"probability": 0.15, "impact": "High", "mitigation": "Soil reclamation"}
+        }
+    }
+
+_RISK_FACTORS = _build_risk_factors()
+
+# SoA views over the per-crop probabilities: one id table plus parallel
+# arrays, stacked so a single gather serves both disease and pest rows
+_CROPS = tuple(_RISK_FACTORS["disease"])
+_CROP_IDX = {name: i for i, name in enumerate(_CROPS)}
+_DISEASE_PROB = np.array([_RISK_FACTORS["disease"][c]["probability"] for c in _CROPS],
+                         dtype=np.float32)
+_PEST_PROB = np.array([_RISK_FACTORS["pest"][c]["probability"] for c in _CROPS],
+                      dtype=np.float32)
+_CROP_RISK_MATRIX = np.vstack((_DISEASE_PROB, _PEST_PROB))
+
+_EMPTY_IDS = np.zeros(0, dtype=np.intp)
+
+# Branchless band tables: the index is the count of thresholds passed,
+# mirroring the _level() trick for the multiplicative adjustments
+_IRR_WEATHER_MULT = np.array([1.0, 0.85, 0.7], dtype=np.float32)   # coverage > 0.5, > 0.8
+_WATER_BASE = np.array([0.6, 0.4, 0.25], dtype=np.float32)         # coverage >= 0.3, >= 0.6
+_EXP_SOIL_MULT = np.array([1.2, 1.0, 0.8], dtype=np.float32)       # experience >= 5, > 15
+_DEBT_MARKET_MULT = np.array([1.0, 1.3], dtype=np.float32)         # debt ratio > 0.5
+# Market multiplier by crop-category diversity, clamped at 4+
+_DIV_MARKET_MULT = np.array([1.0, 1.2, 1.0, 1.0, 0.8], dtype=np.float32)
+
+# Bit position per crop category for the diversity popcount; categories
+# outside the known set fall back to a shared overflow bit
+_CATEGORY_IDX = {"Cereal": 0, "Fiber": 1, "Cash Crop": 2, "Pulse": 3, "Horticulture": 4}
+_CATEGORY_OVERFLOW_BIT = len(_CATEGORY_IDX)
+
+def _risk_probs_kernel(crop_ids, crop_count, crop_diversity, crop_risk_matrix,
+                       coverage, region_id, irr_type_id, soil_id,
+                       experience_years, debt_ratio,
+                       regional_weather, irrigation_risk, soil_risk):
+    """Numeric core of the fused risk pipeline.
+
+    Pure array/scalar math so numba can compile it when available;
+    callers resolve the string attributes to ids first.
+    """
+    probs = np.zeros(6, dtype=np.float32)
+
+    # Disease and pest: one id gather over the stacked matrix
+    if crop_count > 0:
+        for i in range(crop_ids.shape[0]):
+            probs[0] += crop_risk_matrix[0, crop_ids[i]]
+            probs[1] += crop_risk_matrix[1, crop_ids[i]]
+        probs[0] /= crop_count
+        probs[1] /= crop_count
+
+    # Weather: regional base adjusted for irrigation coverage
+    probs[2] = (regional_weather[region_id]
+                * _IRR_WEATHER_MULT[(coverage > 0.5) + (coverage > 0.8)])
+
+    # Market: diversity and debt adjustments on a fixed base
+    probs[3] = (0.35
+                * _DIV_MARKET_MULT[min(crop_diversity, 4)]
+                * _DEBT_MARKET_MULT[int(debt_ratio > 0.5)])
+
+    # Water: coverage band averaged with irrigation-type risk
+    probs[4] = (_WATER_BASE[(coverage >= 0.3) + (coverage >= 0.6)]
+                + irrigation_risk[irr_type_id]) / 2.0
+
+    # Soil: soil-type base adjusted for experience
+    probs[5] = (soil_risk[soil_id]
+                * _EXP_SOIL_MULT[(experience_years >= 5) + (experience_years > 15)])
+
+    return probs
+
+if njit is not None:
+    _risk_probs_kernel = njit(cache=True)(_risk_probs_kernel)
+    # Warm the compilation cache at import so first use is fast
+    _risk_probs_kernel(_EMPTY_IDS, 0, 0, _CROP_RISK_MATRIX, 0.5, 0, 0, 0, 10, 0.1,
+                       _REGIONAL_WEATHER_ARR, _IRRIGATION_RISK_ARR, _SOIL_RISK_ARR)
+
+class RiskAnalyzer:
+    """Risk analysis system for crop planning and farming decisions."""
+
+    _shared = None
+
+    @classmethod
+    def instance(cls) -> "RiskAnalyzer":
+        """Shared analyzer instance.
+
+        The risk database lives at module scope, so construction is
+        cheap; sharing one instance additionally shares the per-farmer
+        analysis cache. Callers needing isolation can still construct
+        their own.
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self):
+        self.risk_factors = _RISK_FACTORS
+        # Per-instance cache keyed on the (hashable) profile and the
+        # crop facts the analysis actually reads; notification pipelines
+        # re-analyze the same farmer repeatedly
+        self._cached_analysis = functools.lru_cache(maxsize=256)(self._compute_risk_analysis)
+
+    def analyze_risks(self, farmer_profile, crop_recommendations) -> Dict[str, Any]:
+        """Comprehensive risk analysis for the farming plan."""
+        crops = crop_recommendations.get('crops')
+        crop_key = tuple((crop['name'], crop['category']) for crop in crops) if crops else ()
+        return self._cached_analysis(farmer_profile, crop_key)
+
+    def analyze_risks_batch(self, farmer_profiles: List[Any],
+                            crop_recommendations: List[Dict]) -> List[Dict[str, Any]]:
+        """Analyze risks for many farmers in one vectorized pass.
+
+        The scalar profile attributes are stacked into arrays and the
+        weather/market/water/soil columns computed for every farmer at
+        once; per-farmer dict packaging is the only remaining loop.
+        Intended for bulk jobs (SMS reports, notifications) where the
+        one-at-a-time path would pay the interpreter cost per farmer.
+        """
+        n = len(farmer_profiles)
+        if n == 0:
+            return []
+
+        coverage = np.fromiter((p.irrigation_coverage for p in farmer_profiles),
+                               dtype=np.float32, count=n)
+        region_ids = np.fromiter(
+            (_REGION_IDS.get(p.region, len(_REGION_IDS)) for p in farmer_profiles),
+            dtype=np.intp, count=n)
+        irr_type_ids = np.fromiter(
+            (_IRRIGATION_TYPE_IDS.get(p.irrigation_type, len(_IRRIGATION_TYPE_IDS))
+             for p in farmer_profiles),
+            dtype=np.intp, count=n)
+        soil_ids = np.fromiter(
+            (_SOIL_IDS.get(p.soil_type, len(_SOIL_IDS)) for p in farmer_profiles),
+            dtype=np.intp, count=n)
+        experience = np.fromiter((p.experience_years for p in farmer_profiles),
+                                 dtype=np.int64, count=n)
+        debt = np.fromiter((p.debt_to_income_ratio for p in farmer_profiles),
+                           dtype=np.float32, count=n)
+
+        probs = np.empty((n, 6), dtype=np.float32)
+        diversity = np.zeros(n, dtype=np.int64)
+        has_crops = np.zeros(n, dtype=bool)
+
+        # Disease/pest need each farmer's crop list; everything else is
+        # pure column math below
+        for row, recs in enumerate(crop_recommendations):
+            crops = recs.get('crops')
+            if crops:
+                ids = np.fromiter(
+                    (_CROP_IDX[key] for key in
+                     (crop['name'].partition(' ')[0].lower() for crop in crops)
+                     if key in _CROP_IDX),
+                    dtype=np.intp)
+                probs[row, 0:2] = _CROP_RISK_MATRIX[:, ids].sum(axis=1) / len(crops)
+                mask = 0
+                for crop in crops:
+                    mask |= 1 << _CATEGORY_IDX.get(crop['category'], _CATEGORY_OVERFLOW_BIT)
+                diversity[row] = mask.bit_count()
+                has_crops[row] = True
+            else:
+                probs[row, 0:2] = 0.0
+
+        probs[:, 2] = (_REGIONAL_WEATHER_ARR[region_ids]
+                       * _IRR_WEATHER_MULT[(coverage > 0.5).astype(np.intp)
+                                           + (coverage > 0.8)])
+        probs[:, 3] = (0.35
+                       * _DIV_MARKET_MULT[np.minimum(diversity, 4)]
+                       * _DEBT_MARKET_MULT[(debt > 0.5).astype(np.intp)])
+        probs[:, 4] = (_WATER_BASE[(coverage >= 0.3).astype(np.intp)
+                                   + (coverage >= 0.6)]
+                       + _IRRIGATION_RISK_ARR[irr_type_ids]) / 2.0
+        probs[:, 5] = (_SOIL_RISK_ARR[soil_ids]
+                       * _EXP_SOIL_MULT[(experience >= 5).astype(np.intp)
+                                        + (experience > 15)])
+
+        return [self._package_analysis(profile, bool(has_crops[row]), probs[row])
+                for row, profile in enumerate(farmer_profiles)]
+
+    def _compute_risk_analysis(self, farmer_profile, crops) -> Dict[str, Any]:
+        """Uncached analysis body; `crops` is a tuple of (name, category)."""
+        probs = self._compute_risk_probs(farmer_profile, crops)
+        return self._package_analysis(farmer_profile, bool(crops), probs)
+
+    def _package_analysis(self, farmer_profile, has_crops, probs) -> Dict[str, Any]:
+        """Build the result dict from a length-6 probability vector."""
+        # Bulk banding against the per-category thresholds
+        tiers = (probs[:, None] >= _CATEGORY_BANDS).sum(axis=1)
+        impact_high = probs > _IMPACT_THRESHOLDS
+
+        risks = [
+            {
+                "level": _LEVELS[tiers[i]],
+                "probability": float(probs[i]) * 100,
+                "impact": _IMPACT_ABOVE[i] if impact_high[i] else _IMPACT_BELOW[i],
+                "mitigation": _CATEGORY_MITIGATIONS[i],
+                "insurance": _CATEGORY_INSURED[i]
+            }
+            for i in range(6)
+        ]
+        if not has_crops:
+            # Disease/pest risk is unknowable without crop picks
+            risks[0] = dict(_UNKNOWN_RISK)
+            risks[1] = dict(_UNKNOWN_RISK)
+
+        disease_risk, pest_risk, weather_risk, market_risk, water_risk, soil_risk = risks
+
+        # Calculate overall risk metrics
+        overall_risk = self._calculate_overall_risk(probs)
+
+        # Economic risk analysis
+        economic_risk = self._analyze_economic_risk(farmer_profile)
+
+        # Environmental risk analysis (reuses the category probabilities)
+        environmental_risk = self._analyze_environmental_risk(probs)
+
+        # Risk tolerance analysis
+        tolerance_analysis = self._analyze_risk_tolerance(farmer_profile, overall_risk)
+
+        return {
+            "overall_risk": overall_risk["level"],
+            "risk_score": overall_risk["score"],
+            "disease_risk": disease_risk,
+            "pest_risk": pest_risk,
+            "weather_risk": weather_risk,
+            "market_risk": market_risk,
+            "water_risk": water_risk,
+            "soil_risk": soil_risk,
+            "economic_risk": economic_risk["level"],
+            "economic_risk_score": economic_risk["score"],
+            "environmental_risk": environmental_risk["level"],
+            "environmental_risk_score": environmental_risk["score"],
+            "tolerance_analysis": tolerance_analysis,
+            "risk_mitigation_strategies": self._generate_mitigation_strategies(risks)
+        }
+
+    def _compute_risk_probs(self, farmer_profile, crops) -> np.ndarray:
+        """Compute all six category probabilities in one fused pass.
+
+        Order matches the module tables: disease, pest, weather, market,
+        water, soil.
+        """
+        # Resolve string attributes to ids (unknown keys hit the default
+        # slot at the end of each array), then hand off to the kernel
+        if crops:
+            ids = np.fromiter(
+                (_CROP_IDX[key] for key in
+                 (name.partition(' ')[0].lower() for name, _ in crops)
+                 if key in _CROP_IDX),
+                dtype=np.intp)
+            crop_count = len(crops)
+            # Diversity as a popcount over category bits: no set allocation
+            mask = 0
+            for _, category in crops:
+                mask |= 1 << _CATEGORY_IDX.get(category, _CATEGORY_OVERFLOW_BIT)
+            crop_diversity = mask.bit_count()
+        else:
+            ids = _EMPTY_IDS
+            crop_count = 0
+            crop_diversity = 0
+
+        return _risk_probs_kernel(
+            ids, crop_count, crop_diversity, _CROP_RISK_MATRIX,
+            farmer_profile.irrigation_coverage,
+            _REGION_IDS.get(farmer_profile.region, len(_REGION_IDS)),
+            _IRRIGATION_TYPE_IDS.get(farmer_profile.irrigation_type, len(_IRRIGATION_TYPE_IDS)),
+            _SOIL_IDS.get(farmer_profile.soil_type, len(_SOIL_IDS)),
+            farmer_profile.experience_years,
+            farmer_profile.debt_to_income_ratio,
+            _REGIONAL_WEATHER_ARR, _IRRIGATION_RISK_ARR, _SOIL_RISK_ARR)
+    
+    def _calculate_overall_risk(self, probs: np.ndarray) -> Dict[str, Any]:
+        """Calculate overall risk from the six category probabilities."""
+        overall_risk_score = float(np.vdot(probs, _OVERALL_WEIGHTS)) / sum(_OVERALL_WEIGHTS)
+
+        return {
+            "level": _level(overall_risk_score, 0.3, 0.5),
+            "score": overall_risk_score
+        }
+    
+    def _analyze_economic_risk(self, farmer_profile) -> Dict[str, Any]:
+        """Analyze economic risks based on financial profile."""
+        # Calculate economic risk factors
+        debt_risk = min(1.0, farmer_profile.debt_to_income_ratio * 2)
+        investment_risk = 1.0 - (farmer_profile.investment_capacity / farmer_profile.annual_income)
+        cash_flow_risk = 1.0 - (farmer_profile.savings / farmer_profile.annual_income)
+        
+        # Weighted economic risk
+        economic_risk_score = (debt_risk * 0.4 + investment_risk * 0.3 + cash_flow_risk * 0.3)
+
+        return {
+            "level": _level(economic_risk_score, 0.3, 0.6),
+            "score": economic_risk_score
+        }
+    
+    def _analyze_environmental_risk(self, probs: np.ndarray) -> Dict[str, Any]:
+        """Analyze environmental risks from the weather/water/soil probabilities."""
+        environmental_risk_score = float(
+            probs[2] * 0.4 +  # weather
+            probs[4] * 0.4 +  # water
+            probs[5] * 0.2    # soil
+        )
+
+        return {
+            "level": _level(environmental_risk_score, 0.3, 0.5),
+            "score": environmental_risk_score
+        }
+    
+    def _analyze_risk_tolerance(self, farmer_profile, overall_risk) -> Dict[str, Any]:
+        """Analyze compatibility between farmer's risk tolerance and overall risk."""
+        farmer_tolerance = _RISK_TOLERANCE_SCORES.get(farmer_profile.risk_tolerance, 0.5)
+
+        recommended_risk, adjusted_recommendation, compatibility_score = \
+            _tolerance_assessment(round(overall_risk["score"] * 100),
+                                  round(farmer_tolerance * 100))
+
+        return {
+            "recommended_risk": recommended_risk,
+            "compatibility_score": compatibility_score,
+            "max_loss_tolerance": farmer_profile.savings * 0.3,
+            "min_profit_target": farmer_profile.annual_income * 0.1,
+            "adjusted_recommendation": adjusted_recommendation
+        }
+    
+    def _generate_mitigation_strategies(self, risk_categories) -> List[str]:
+        """Generate mitigation strategies for identified risks."""
+        # Single pass with a seen-set keeps category order stable, unlike
+        # the previous list(set(...)) dedup
+        seen = set()
+        strategies = []
+
+        for risk in risk_categories:
+            suffix = _RISK_SUFFIX.get(risk["level"])
+            if suffix is not None:
+                strategy = risk["mitigation"] + suffix
+                if strategy not in seen:
+                    seen.add(strategy)
+                    strategies.append(strategy)
+
+        strategies.extend(s for s in _GENERAL_STRATEGIES if s not in seen)
+        return strategies